@@ -0,0 +1,289 @@
+import os
+import math
+import asyncio
+import time
+import threading
+from functools import wraps
+from flask import request, jsonify
+
+# Interactive traffic (live interview turns) outranks batch traffic (resume
+# reviews, path prediction, bulk ranking). Slots are shared, but a batch
+# request only takes one when no interactive request is waiting and the
+# batch pool is under its own cap, so a review burst queues behind, not in
+# front of, a candidate's next question.
+#
+# gunicorn hands a request one of its WEB_THREADS threads before admission
+# ever sees it, and a queued request keeps that thread while it waits. So
+# the batch and speculative pools together (running plus queued) are sized
+# to leave INTERACTIVE_RESERVE threads that only interview turns can reach;
+# otherwise a review burst would park every thread and push interview
+# requests into gunicorn's own queue, where priorities don't apply.
+WEB_THREADS = int(os.getenv("WEB_THREADS", "16"))
+TOTAL_SLOTS = int(os.getenv("ADMISSION_TOTAL_SLOTS", str(WEB_THREADS)))
+INTERACTIVE_RESERVE = int(os.getenv("ADMISSION_INTERACTIVE_RESERVE", str(max(1, WEB_THREADS // 4))))
+_SHARED_THREADS = max(2, WEB_THREADS - INTERACTIVE_RESERVE)
+
+SPECULATIVE_LIMIT = int(os.getenv("ADMISSION_SPECULATIVE_LIMIT", str(max(1, _SHARED_THREADS // 6))))
+_BATCH_THREADS = max(1, _SHARED_THREADS - SPECULATIVE_LIMIT)
+BATCH_LIMIT = int(os.getenv("ADMISSION_BATCH_LIMIT", str(max(1, _BATCH_THREADS // 2))))
+BATCH_QUEUE = min(int(os.getenv("ADMISSION_BATCH_QUEUE", "16")), max(0, _BATCH_THREADS - BATCH_LIMIT))
+
+POOLS = {
+    "interactive": {
+        "priority": 0,
+        "limit": int(os.getenv("ADMISSION_INTERACTIVE_LIMIT", str(TOTAL_SLOTS))),
+        "max_queue": int(os.getenv("ADMISSION_INTERACTIVE_QUEUE", "32")),
+        "queue_timeout": float(os.getenv("ADMISSION_INTERACTIVE_TIMEOUT", "2")),
+        "rate": float(os.getenv("ADMISSION_INTERACTIVE_RATE", "2")),
+        "burst": float(os.getenv("ADMISSION_INTERACTIVE_BURST", "10")),
+    },
+    "batch": {
+        "priority": 1,
+        "limit": BATCH_LIMIT,
+        "max_queue": BATCH_QUEUE,
+        "queue_timeout": float(os.getenv("ADMISSION_BATCH_TIMEOUT", "10")),
+        "rate": float(os.getenv("ADMISSION_BATCH_RATE", "0.5")),
+        "burst": float(os.getenv("ADMISSION_BATCH_BURST", "5")),
+    },
+    # Partial-transcript updates only schedule speculative work; they are
+    # shed immediately rather than queued behind real turns.
+    "speculative": {
+        "priority": 2,
+        "limit": SPECULATIVE_LIMIT,
+        "max_queue": int(os.getenv("ADMISSION_SPECULATIVE_QUEUE", "0")),
+        "queue_timeout": float(os.getenv("ADMISSION_SPECULATIVE_TIMEOUT", "0")),
+        "rate": float(os.getenv("ADMISSION_SPECULATIVE_RATE", "5")),
+        "burst": float(os.getenv("ADMISSION_SPECULATIVE_BURST", "20")),
+    },
+}
+
+MAX_TRACKED_CLIENTS = 10000
+CLIENT_ID_HEADER = "X-Client-Id"
+MAX_CLIENT_ID_LENGTH = 128
+
+
+class Rejected(Exception):
+    def __init__(self, status: int, message: str, retry_after: float):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class Pool:
+    def __init__(self, name: str, priority: int, limit: int, max_queue: int, queue_timeout: float,
+                 rate: float, burst: float):
+        self.name = name
+        self.priority = priority
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.rate = rate
+        self.burst = burst
+        self.active = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.rate_limited = 0
+        self.total_wait = 0.0
+        self.buckets = {}  # client -> (tokens, last refill)
+
+
+class AdmissionController:
+    def __init__(self, pools=POOLS, total_slots: int = TOTAL_SLOTS):
+        self.total_slots = total_slots
+        self.pools = {name: Pool(name, **config) for name, config in pools.items()}
+        self._cond = threading.Condition()
+        self._active = 0
+        # Futures of coroutines queued in acquire_async(); resolved on every
+        # release so they re-check, like notify_all() for the threaded path.
+        self._waiters = []
+
+    def _take_token(self, pool: Pool, client: str):
+        if pool.rate <= 0:
+            return
+        now = time.monotonic()
+        tokens, last = pool.buckets.get(client, (pool.burst, now))
+        tokens = min(pool.burst, tokens + (now - last) * pool.rate)
+        if tokens < 1:
+            pool.buckets[client] = (tokens, now)
+            pool.rate_limited += 1
+            raise Rejected(429, "Too many requests", (1 - tokens) / pool.rate)
+        pool.buckets[client] = (tokens - 1, now)
+        if len(pool.buckets) > MAX_TRACKED_CLIENTS:
+            # Clients idle long enough to have refilled are indistinguishable from new ones.
+            full_after = pool.burst / pool.rate
+            pool.buckets = {c: b for c, b in pool.buckets.items() if now - b[1] < full_after}
+
+    def _can_run(self, pool: Pool) -> bool:
+        if self._active >= self.total_slots or pool.active >= pool.limit:
+            return False
+        return not any(p.queued for p in self.pools.values() if p.priority < pool.priority)
+
+    def acquire(self, pool_name: str, client: str):
+        pool = self.pools[pool_name]
+        with self._cond:
+            self._take_token(pool, client)
+            if pool.queued == 0 and self._can_run(pool):
+                return self._admit(pool, 0.0)
+            if pool.queued >= pool.max_queue:
+                pool.rejected_queue_full += 1
+                raise Rejected(503, "Server busy", pool.queue_timeout)
+
+            start = time.monotonic()
+            deadline = start + pool.queue_timeout
+            pool.queued += 1
+            try:
+                while not self._can_run(pool):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        pool.rejected_timeout += 1
+                        raise Rejected(503, "Server busy", pool.queue_timeout)
+                    self._cond.wait(remaining)
+            finally:
+                pool.queued -= 1
+                # Our leaving the queue may unblock a lower-priority pool.
+                self._cond.notify_all()
+            return self._admit(pool, time.monotonic() - start)
+
+    def _admit(self, pool: Pool, waited: float):
+        pool.active += 1
+        pool.admitted += 1
+        pool.total_wait += waited
+        self._active += 1
+
+    def release(self, pool_name: str):
+        with self._cond:
+            self.pools[pool_name].active -= 1
+            self._active -= 1
+            self._cond.notify_all()
+        self._wake_async()
+
+    def _wake_async(self):
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def acquire_async(self, pool_name: str, client: str):
+        """acquire() for the event loop: a queued request waits on a future, not a thread.
+
+        A controller serves either threaded or async views; the async path
+        must only be used from one event loop.
+        """
+        pool = self.pools[pool_name]
+        with self._cond:
+            self._take_token(pool, client)
+            if pool.queued == 0 and self._can_run(pool):
+                return self._admit(pool, 0.0)
+            if pool.queued >= pool.max_queue:
+                pool.rejected_queue_full += 1
+                raise Rejected(503, "Server busy", pool.queue_timeout)
+            pool.queued += 1
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + pool.queue_timeout
+        try:
+            while True:
+                with self._cond:
+                    if self._can_run(pool):
+                        return self._admit(pool, loop.time() - start)
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    with self._cond:
+                        pool.rejected_timeout += 1
+                    raise Rejected(503, "Server busy", pool.queue_timeout)
+                waiter = loop.create_future()
+                self._waiters.append(waiter)
+                try:
+                    await asyncio.wait_for(waiter, remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._cond:
+                pool.queued -= 1
+            # Our leaving the queue may unblock a lower-priority pool.
+            self._wake_async()
+
+    def admit(self, pool_name: str):
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                try:
+                    self.acquire(pool_name, client_id())
+                except Rejected as e:
+                    return jsonify({"error": str(e)}), e.status, {"Retry-After": str(e.retry_after)}
+
+                try:
+                    response = view(*args, **kwargs)
+                except BaseException:
+                    self.release(pool_name)
+                    raise
+                # Streamed bodies keep working after the view returns, so
+                # their slot is only freed once the body is fully sent.
+                body = response[0] if isinstance(response, tuple) else response
+                if getattr(body, "is_streamed", False):
+                    body.call_on_close(lambda: self.release(pool_name))
+                else:
+                    self.release(pool_name)
+                return response
+            return wrapper
+        return decorator
+
+    def admit_async(self, pool_name: str, client=None):
+        """admit() for async views (ai/asgi.py); client returns the caller's id inside a request."""
+        client = client or client_id
+
+        def decorator(view):
+            @wraps(view)
+            async def wrapper(*args, **kwargs):
+                try:
+                    await self.acquire_async(pool_name, client())
+                except Rejected as e:
+                    return {"error": str(e)}, e.status, {"Retry-After": str(e.retry_after)}
+                try:
+                    return await view(*args, **kwargs)
+                finally:
+                    self.release(pool_name)
+            return wrapper
+        return decorator
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "total_slots": self.total_slots,
+                "active": self._active,
+                "pools": {
+                    name: {
+                        "priority": p.priority,
+                        "active": p.active,
+                        "limit": p.limit,
+                        "queued": p.queued,
+                        "max_queue": p.max_queue,
+                        "queue_timeout": p.queue_timeout,
+                        "admitted": p.admitted,
+                        "rejected_queue_full": p.rejected_queue_full,
+                        "rejected_timeout": p.rejected_timeout,
+                        "rate_limited": p.rate_limited,
+                        "avg_queue_wait": p.total_wait / p.admitted if p.admitted else 0.0,
+                        "tracked_clients": len(p.buckets),
+                    }
+                    for name, p in self.pools.items()
+                },
+            }
+
+
+def client_id(req=None) -> str:
+    if req is None:
+        req = request
+    # Requests arrive from the Next.js API routes, so the network address is
+    # that server for every user; the routes forward the browser's identity
+    # in X-Client-Id (frontend/lib/ai-client.ts).
+    forwarded_id = req.headers.get(CLIENT_ID_HEADER, "").strip()
+    if forwarded_id:
+        return forwarded_id[:MAX_CLIENT_ID_LENGTH]
+    # Only the rightmost X-Forwarded-For hop was appended by our proxy;
+    # everything left of it is whatever the client chose to send.
+    route = req.access_route
+    return (route[-1] if route else None) or req.remote_addr or "unknown"
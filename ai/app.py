@@ -1,27 +1,32 @@
 import os
-import base64
-import json
+import uuid
 from pathlib import Path
-from flask import Flask, request, jsonify, after_this_request, Response, send_file
+from flask import Flask, request, jsonify, after_this_request, Response, send_file, stream_with_context
 from flask_cors import CORS
-from .main import skills_extract, check_with_jd, path_predictor
+from .main import skills_extract, check_with_jd, path_predictor, path_cache, CACHE_MODES
 from .interview import ai_client, ai_review, text_to_speech
 from .interview import start_interview as ai_start_interview, end_interview
 from .plagiarism.final import plagiarism_checker
+from .resume import ResumeDocument
+from .ranking import rank_applicants, load_documents, DEFAULT_TOP_K
+from .admission import AdmissionController
+from .speculation import SpeculationManager
+from .multipart import Part, multipart_response
 
 app = Flask(__name__)
 CORS(app, supports_credentials=True, origins=["http://localhost:3000", "https://valecta-statuscode2-frontend.onrender.com"])
 
-RESUME_FOLDER = "store"
-os.makedirs(RESUME_FOLDER, exist_ok=True)
-
 VOICE_FOLDER = "human-audio-store"
 os.makedirs(VOICE_FOLDER, exist_ok=True)
 
 AI_VOICE_FOLDER = "ai-audio-store"
-os.makedirs(AI_VOICE_FOLDER, exist_ok=True)
+os.makedirs(Path(__file__).parent / AI_VOICE_FOLDER, exist_ok=True)
+
+admission = AdmissionController()
+speculation = SpeculationManager(Path(__file__).parent / AI_VOICE_FOLDER)
 
 @app.route('/resume-review', methods=['POST'])
+@admission.admit("batch")
 def resume_review():
     try:
         data = request.get_json()
@@ -29,24 +34,15 @@ def resume_review():
         if not data or "filedata" not in data or "job_description" not in data:
             return jsonify({"error": "Invalid request, need filedata"}), 400
         
-        filedata = data["filedata"]
+        resume = ResumeDocument.from_base64(data["filedata"])
         job_description = data["job_description"]
 
-        pdf_bytes = base64.b64decode(filedata)
-
-        file_path = os.path.join(RESUME_FOLDER, "resume.pdf")
-        with open(file_path, "wb") as f:
-            f.write(pdf_bytes)
+        extracted_skills = skills_extract(resume)
 
-        extracted_skills = skills_extract(file_path)
-
-        plagarism_check = plagiarism_checker(file_path)
+        plagarism_check = plagiarism_checker(resume)
 
         ai_review = check_with_jd(extracted_skills, job_description)
 
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
         ai_output = True
         if not plagarism_check or not ai_review:
             ai_output = False
@@ -57,7 +53,42 @@ def resume_review():
         return jsonify({"error": str(e)}), 500
     
 
+@app.route('/rank-applicants', methods=['POST'])
+@admission.admit("batch")
+def rank_applicants_route():
+    data = request.get_json()
+
+    if not data or "resumes" not in data or "job_description" not in data:
+        return jsonify({"error": "Invalid request, need job_description and resumes"}), 400
+
+    resumes = data["resumes"]
+    if not isinstance(resumes, list) or not all(isinstance(r, dict) and "filedata" in r for r in resumes):
+        return jsonify({"error": "Invalid request, every resume needs filedata"}), 400
+
+    try:
+        top_k = max(0, int(data.get("top_k", DEFAULT_TOP_K)))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid request, top_k must be an integer"}), 400
+
+    # Decode and parse before streaming starts, so bad input is a 400 rather
+    # than an exception halfway through the response body.
+    try:
+        documents = load_documents(resumes)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    ranking = rank_applicants(
+        data["job_description"],
+        resumes,
+        documents,
+        required_skills=data.get("required_skills"),
+        top_k=top_k,
+    )
+    return Response(stream_with_context(ranking), mimetype="application/x-ndjson")
+
+
 @app.route('/interview', methods=['POST'])
+@admission.admit("interactive")
 def interview():
     # data = request.get_json()
         
@@ -85,44 +116,56 @@ def interview():
 
     score = ai_review(job_description, question, model_answer, human_answer)
 
-    qna = ai_client(job_description, human_answer)
-    question = qna.get("question")
-    model_answer = qna.get("answer")
-
-    ai_voice_path = Path(__file__).parent / AI_VOICE_FOLDER / "ai_voice.mp3"
-    text_to_speech(question, ai_voice_path)
-
-    @after_this_request
-    def remove_files(response):
+    # A follow-up prepared from /interview/partial updates skips both round trips.
+    prepared = None
+    if data.get("session_id"):
+        prepared = speculation.take(data["session_id"], job_description, human_answer)
+
+    audio_part = None
+    if prepared:
+        question, model_answer, audio = prepared
+        audio_part = Part.raw(audio, "audio/mpeg", "processed.mp3")
+    else:
+        qna = ai_client(job_description, human_answer)
+        question = qna.get("question")
+        model_answer = qna.get("answer")
+
+        ai_voice_path = Path(__file__).parent / AI_VOICE_FOLDER / f"ai_voice_{uuid.uuid4().hex}.mp3"
         try:
-            os.remove(ai_voice_path)
+            text_to_speech(question, ai_voice_path)
+            # Streamed from disk and deleted once sent.
+            audio_part = Part.file(ai_voice_path, "audio/mpeg", "processed.mp3", delete=True)
         except Exception as e:
-            print("File delete error: ", e)
+            # The question still goes out as a JSON-only response.
+            print("Text to speech error: ", e)
+            ai_voice_path.unlink(missing_ok=True)
 
-        return response
-    
-    with open(ai_voice_path, "rb") as f:
-        file_bytes = f.read()
-    boundary = "valecta"
+    json_part = Part.json({ "question": f"{question}", "model_answer": f"{model_answer}", "score": f"{score}" })
+    parts = [json_part, audio_part] if audio_part else [json_part]
 
-    json_part = f"--{boundary}\r\nContent-Type: application/json\r\n\r\n{json.dumps({ "question": f"{question}", "model_answer": f"{model_answer}", "score": f"{score}" })}\r\n"
+    return multipart_response(Response, *parts)
 
-    file_part = f"--{boundary}\r\nContent-Type: audio/mpeg\r\nContent-Disposition: attachment; filename=processed.mp3\r\n\r\n"
 
-    closing = f"\r\n--{boundary}--\r\n"
+@app.route('/interview/partial', methods=['POST'])
+@admission.admit("speculative")
+def interview_partial():
+    data = request.form.to_dict()
 
-    body = json_part.encode() + file_part.encode() + file_bytes + closing.encode()
+    if not data or "session_id" not in data or "partial_answer_text" not in data or "job_description" not in data:
+        return jsonify({"error": "Invalid request"}), 400
 
-    return Response(body, mimetype=f"multipart/mixed; boundary={boundary}")
+    started = speculation.update(data["session_id"], data["job_description"], data["partial_answer_text"])
+    return jsonify({"message": "Partial answer received", "speculating": started}), 202
 
 
 @app.route("/start-interview", methods=["POST"])
+@admission.admit("interactive")
 def start_interview():
     data = request.get_json()
     job_description = data["job_description"]
 
     ai_starter = ai_start_interview(job_description)
-    ai_voice_path = Path(__file__).parent / AI_VOICE_FOLDER / "ai_voice.mp3"
+    ai_voice_path = Path(__file__).parent / AI_VOICE_FOLDER / f"ai_voice_{uuid.uuid4().hex}.mp3"
     text_to_speech(ai_starter, ai_voice_path)
 
     @after_this_request
@@ -143,32 +186,43 @@ def start_interview():
 
 
 @app.route('/path-predict', methods=['POST'])
+@admission.admit("batch")
 def path_predict():
     try:
         data = request.get_json()
         
         if not data or "filedata" not in data:
             return jsonify({"error": "Invalid request, need filedata"}), 400
-        
-        filedata = data["filedata"]
-        pdf_bytes = base64.b64decode(filedata)
-
-        file_path = os.path.join(RESUME_FOLDER, "resume.pdf")
-        with open(file_path, "wb") as f:
-            f.write(pdf_bytes)
 
-        extracted_skills = skills_extract(file_path)
+        cache = data.get("cache", "use")
+        if cache not in CACHE_MODES:
+            return jsonify({"error": f"Invalid request, cache must be one of {', '.join(CACHE_MODES)}"}), 400
+        
+        resume = ResumeDocument.from_base64(data["filedata"])
 
-        predicted_path = path_predictor(extracted_skills)
+        extracted_skills = skills_extract(resume)
 
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        predicted_path = path_predictor(extracted_skills, cache=cache)
 
         return jsonify({"message": "Path is predicted", "value": f"{predicted_path}"}), 200
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     
+@app.route('/path-predict/cache', methods=['GET', 'DELETE'])
+def path_predict_cache():
+    if request.method == 'DELETE':
+        path_cache.invalidate()
+    return jsonify(path_cache.stats()), 200
+
+@app.route('/metrics/admission', methods=['GET'])
+def admission_metrics():
+    return jsonify(admission.stats()), 200
+
+@app.route('/metrics/speculation', methods=['GET'])
+def speculation_metrics():
+    return jsonify(speculation.stats()), 200
+
 # @app.route("/end-interview", methods=["GET"])
 # def interview_end():
 #     file_path = Path(__file__).parent / AI_VOICE_FOLDER / "outro.mp3"
@@ -187,6 +241,7 @@ def path_predict():
 #     return send_file(file_path, as_attachment=True)
 
 @app.route("/end-interview", methods=["POST"])
+@admission.admit("interactive")
 def interview_end():
     # ✅ Get form-data
     data = request.form.to_dict()
@@ -206,41 +261,21 @@ def interview_end():
     outro_text = end_interview(job_description, human_answer)
 
     # ✅ Step 3: Generate outro audio
-    file_path = Path(__file__).parent / AI_VOICE_FOLDER / "outro.mp3"
-    text_to_speech(outro_text, file_path)
-
-    @after_this_request
-    def remove_files(response):
-        try:
-            os.remove(file_path)
-        except Exception as e:
-            print("File delete error: ", e)
-        return response
-
-    with open(file_path, "rb") as f:
-        file_bytes = f.read()
-
-    boundary = "valecta"
-
-    # ✅ JSON payload (outro + score)
-    json_part = (
-        f"--{boundary}\r\n"
-        f"Content-Type: application/json\r\n\r\n"
-        f"{json.dumps({ 'outro': outro_text, 'score': score })}\r\n"
-    )
-
-    # ✅ Audio part
-    file_part = (
-        f"--{boundary}\r\n"
-        f"Content-Type: audio/mpeg\r\n"
-        f"Content-Disposition: attachment; filename=outro.mp3\r\n\r\n"
-    )
-
-    closing = f"\r\n--{boundary}--\r\n"
+    file_path = Path(__file__).parent / AI_VOICE_FOLDER / f"outro_{uuid.uuid4().hex}.mp3"
+    audio_part = None
+    try:
+        text_to_speech(outro_text, file_path)
+        audio_part = Part.file(file_path, "audio/mpeg", "outro.mp3", delete=True)
+    except Exception as e:
+        # The score still goes out as a JSON-only response, like /interview.
+        print("Text to speech error: ", e)
+        file_path.unlink(missing_ok=True)
 
-    body = json_part.encode() + file_part.encode() + file_bytes + closing.encode()
+    # ✅ JSON payload (outro + score) and audio part
+    json_part = Part.json({ 'outro': outro_text, 'score': score })
+    parts = [json_part, audio_part] if audio_part else [json_part]
 
-    return Response(body, mimetype=f"multipart/mixed; boundary={boundary}")
+    return multipart_response(Response, *parts)
 
     
 if __name__ == "__main__":
@@ -0,0 +1,229 @@
+import os
+import asyncio
+import httpx
+from quart import Quart, request, jsonify, Response
+from quart_cors import cors
+from .main import skills_extract_async, check_with_jd_async, path_predictor_async, path_cache, CACHE_MODES
+from .interview import ai_client_async, ai_review_async, text_to_speech_async
+from .interview import start_interview_async, end_interview_async
+from .plagiarism.final import plagiarism_checker_async
+from .resume import ResumeDocument
+from .admission import AdmissionController, POOLS, client_id
+from .multipart import Part, multipart_response
+from .speculation import AsyncSpeculationManager
+
+# Async serving mode: the same routes as app.py, but every OpenAI call and
+# certificate fetch is awaited, so one process holds many in-flight requests
+# instead of one per gunicorn worker:
+#
+#     gunicorn ai.asgi:app -k uvicorn.workers.UvicornWorker
+#
+# /rank-applicants stays on the sync server (ai.app). Speculative follow-up
+# questions run as event-loop tasks, so they stay within the worker that
+# received the partial answers, as with the sync server.
+
+app = cors(
+    Quart(__name__),
+    allow_origin=["http://localhost:3000", "https://valecta-statuscode2-frontend.onrender.com"],
+    allow_credentials=True,
+)
+
+# Waiting on an awaited call costs a coroutine, not a thread, so the slot
+# budget is far larger than the threaded server's. The same goes for a
+# queued request, so the queues are sized from the slot budget too rather
+# than from gthread's thread count (POOLS["batch"]["max_queue"] is clamped
+# to whatever threads the threaded server has left over).
+ASGI_TOTAL_SLOTS = int(os.getenv("ASGI_TOTAL_SLOTS", "256"))
+admission = AdmissionController(
+    pools={
+        "interactive": {**POOLS["interactive"], "limit": ASGI_TOTAL_SLOTS,
+                        "max_queue": ASGI_TOTAL_SLOTS // 2},
+        "batch": {**POOLS["batch"], "limit": max(1, ASGI_TOTAL_SLOTS // 2),
+                  "max_queue": ASGI_TOTAL_SLOTS // 2},
+        "speculative": {**POOLS["speculative"], "limit": max(1, ASGI_TOTAL_SLOTS // 4)},
+    },
+    total_slots=ASGI_TOTAL_SLOTS,
+)
+speculation = AsyncSpeculationManager()
+
+
+def _client():
+    return client_id(request)
+
+
+@app.before_serving
+async def open_http():
+    app.http = httpx.AsyncClient()
+
+
+@app.after_serving
+async def close_http():
+    await app.http.aclose()
+
+
+@app.route('/resume-review', methods=['POST'])
+@admission.admit_async("batch", _client)
+async def resume_review():
+    try:
+        data = await request.get_json()
+
+        if not data or "filedata" not in data or "job_description" not in data:
+            return jsonify({"error": "Invalid request, need filedata"}), 400
+
+        resume = await ResumeDocument.from_base64(data["filedata"]).parse_async()
+        job_description = data["job_description"]
+
+        extracted_skills, plagarism_check = await asyncio.gather(
+            skills_extract_async(resume),
+            plagiarism_checker_async(resume, app.http),
+        )
+
+        ai_review = await check_with_jd_async(extracted_skills, job_description)
+
+        ai_output = True
+        if not plagarism_check or not ai_review:
+            ai_output = False
+
+        return jsonify({"message": "Candidate Status", "value": f"{ai_output}"}), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/interview', methods=['POST'])
+@admission.admit_async("interactive", _client)
+async def interview():
+    data = (await request.form).to_dict()
+
+    if not data or "human_answer_text" not in data or "job_description" not in data:
+        return jsonify({"error": "Invalid request"}), 400
+
+    question = data.get("question", "")
+    model_answer = data.get("model_answer", "")
+    human_answer = data["human_answer_text"]
+    job_description = data["job_description"]
+
+    async def next_question():
+        # A follow-up prepared from /interview/partial updates skips both round trips.
+        if data.get("session_id"):
+            prepared = await speculation.take_async(data["session_id"], job_description, human_answer)
+            if prepared:
+                return prepared
+        qna = await ai_client_async(job_description, human_answer)
+        try:
+            audio = await text_to_speech_async(qna.get("question"))
+        except Exception as e:
+            # The question still goes out as a JSON-only response.
+            print("Text to speech error: ", e)
+            audio = None
+        return qna.get("question"), qna.get("answer"), audio
+
+    # Grading the last answer and writing the next question are independent.
+    score, (question, model_answer, audio) = await asyncio.gather(
+        ai_review_async(job_description, question, model_answer, human_answer),
+        next_question(),
+    )
+
+    parts = [Part.json({"question": f"{question}", "model_answer": f"{model_answer}", "score": f"{score}"})]
+    if audio:
+        parts.append(Part.raw(audio, "audio/mpeg", "processed.mp3"))
+    return multipart_response(Response, *parts)
+
+
+@app.route('/interview/partial', methods=['POST'])
+@admission.admit_async("speculative", _client)
+async def interview_partial():
+    data = (await request.form).to_dict()
+
+    if not data or "session_id" not in data or "partial_answer_text" not in data or "job_description" not in data:
+        return jsonify({"error": "Invalid request"}), 400
+
+    started = speculation.update(data["session_id"], data["job_description"], data["partial_answer_text"])
+    return jsonify({"message": "Partial answer received", "speculating": started}), 202
+
+
+@app.route("/start-interview", methods=["POST"])
+@admission.admit_async("interactive", _client)
+async def start_interview():
+    data = await request.get_json()
+    job_description = data["job_description"]
+
+    ai_starter = await start_interview_async(job_description)
+    audio = await text_to_speech_async(ai_starter)
+
+    return Response(audio, mimetype="audio/mpeg",
+                    headers={"Content-Disposition": "attachment; filename=intro.mp3"})
+
+
+@app.route('/path-predict', methods=['POST'])
+@admission.admit_async("batch", _client)
+async def path_predict():
+    try:
+        data = await request.get_json()
+
+        if not data or "filedata" not in data:
+            return jsonify({"error": "Invalid request, need filedata"}), 400
+
+        cache = data.get("cache", "use")
+        if cache not in CACHE_MODES:
+            return jsonify({"error": f"Invalid request, cache must be one of {', '.join(CACHE_MODES)}"}), 400
+
+        resume = ResumeDocument.from_base64(data["filedata"])
+
+        extracted_skills = await skills_extract_async(resume)
+
+        predicted_path = await path_predictor_async(extracted_skills, cache=cache)
+
+        return jsonify({"message": "Path is predicted", "value": f"{predicted_path}"}), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/path-predict/cache', methods=['GET', 'DELETE'])
+async def path_predict_cache():
+    if request.method == 'DELETE':
+        path_cache.invalidate()
+    return jsonify(path_cache.stats()), 200
+
+
+@app.route('/metrics/admission', methods=['GET'])
+async def admission_metrics():
+    return jsonify(admission.stats()), 200
+
+
+@app.route('/metrics/speculation', methods=['GET'])
+async def speculation_metrics():
+    return jsonify(speculation.stats()), 200
+
+
+@app.route("/end-interview", methods=["POST"])
+@admission.admit_async("interactive", _client)
+async def interview_end():
+    data = (await request.form).to_dict()
+
+    if not data or "human_answer" not in data or "job_description" not in data:
+        return jsonify({"error": "Invalid request"}), 400
+
+    job_description = data["job_description"]
+    question = data.get("question", "")
+    model_answer = data.get("model_answer", "")
+    human_answer = data["human_answer"]
+
+    score, outro_text = await asyncio.gather(
+        ai_review_async(job_description, question, model_answer, human_answer),
+        end_interview_async(job_description, human_answer),
+    )
+
+    parts = [Part.json({'outro': outro_text, 'score': score})]
+    try:
+        parts.append(Part.raw(await text_to_speech_async(outro_text), "audio/mpeg", "outro.mp3"))
+    except Exception as e:
+        # The score still goes out as a JSON-only response.
+        print("Text to speech error: ", e)
+
+    return multipart_response(Response, *parts)
+
+
+if __name__ == "__main__":
+    app.run(debug=True)
@@ -0,0 +1,191 @@
+"""Load-test the sync and async servers: in-flight requests held per GB of RAM.
+
+    python -m ai.bench_async [--concurrency 16 64 256] [--latency 1.0]
+
+OpenAI is replaced by a local stub that answers chat and speech calls after
+--latency seconds, so the numbers measure the server's waiting capacity, not
+the model. Each configuration serves /interview (two chat calls and one TTS
+call per turn) and is measured for throughput, latency, peak RSS of its
+whole process tree and the peak number of upstream calls it kept waiting at
+once. Needs ai/plagiarism/Resume.csv, like the app itself.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from multiprocessing import Process, Value
+import httpx
+import psutil
+
+CONFIGS = {
+    "sync x4": ["gunicorn", "ai.app:app", "-w", "4", "-k", "sync"],
+    "gthread 1x16": ["gunicorn", "ai.app:app", "-w", "1", "-k", "gthread", "--threads", "16"],
+    "asgi x1": ["gunicorn", "ai.asgi:app", "-w", "1", "-k", "uvicorn.workers.UvicornWorker"],
+}
+
+CHAT_CONTENT = json.dumps({
+    "question": "Tell me about a project where you used Python.",
+    "answer": "A model answer.",
+    "score": 7.5,
+    "outro": "Thanks for your time.",
+    "ai_starter": "Welcome!",
+    "response": True,
+})
+SPEECH_BYTES = b"\xff\xf3" * 24000
+
+
+def run_stub(port: int, latency: float, in_flight):
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *headers = head.decode("latin-1").split("\r\n")
+                length = 0
+                for header in headers:
+                    name, _, value = header.partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+                with in_flight.get_lock():
+                    in_flight.value += 1
+                try:
+                    await asyncio.sleep(latency)
+                finally:
+                    with in_flight.get_lock():
+                        in_flight.value -= 1
+
+                if "/audio/speech" in request_line:
+                    body, content_type = SPEECH_BYTES, "audio/mpeg"
+                else:
+                    body = json.dumps({
+                        "id": "chatcmpl-bench", "object": "chat.completion", "created": 0, "model": "gpt-4.1",
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": CHAT_CONTENT, "refusal": None}}],
+                    }).encode()
+                    content_type = "application/json"
+                writer.write(
+                    f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                    + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", port, backlog=4096)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def tree_rss(proc: psutil.Process) -> int:
+    total = 0
+    for p in [proc] + proc.children(recursive=True):
+        try:
+            total += p.memory_info().rss
+        except psutil.NoSuchProcess:
+            pass
+    return total
+
+
+async def load(port: int, concurrency: int, requests: int, proc: psutil.Process, upstream):
+    form = {"human_answer_text": "I built a Flask API backed by Postgres.",
+            "job_description": "Backend engineer, Python", "question": "Q", "model_answer": "A"}
+    latencies, errors, peak_rss, peak_upstream = [], 0, 0, 0
+    remaining = requests
+
+    async def worker(client):
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                resp = await client.post(f"http://127.0.0.1:{port}/interview", data=form)
+                if resp.status_code != 200:
+                    errors += 1
+                    continue
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    async def sample():
+        nonlocal peak_rss, peak_upstream
+        while True:
+            peak_rss = max(peak_rss, tree_rss(proc))
+            peak_upstream = max(peak_upstream, upstream.value)
+            await asyncio.sleep(0.05)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(timeout=300, limits=limits) as client:
+        sampler = asyncio.create_task(sample())
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        sampler.cancel()
+    return latencies, errors, elapsed, peak_rss, peak_upstream
+
+
+def wait_ready(port: int, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/path-predict/cache", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.5)
+    raise RuntimeError("server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--latency", type=float, default=1.0, help="stub seconds per upstream call")
+    parser.add_argument("--rounds", type=int, default=3, help="requests per client")
+    parser.add_argument("--configs", nargs="+", default=list(CONFIGS))
+    args = parser.parse_args()
+
+    stub_port, app_port = 18100, 18101
+    upstream = Value("i", 0)
+    stub = Process(target=run_stub, args=(stub_port, args.latency, upstream), daemon=True)
+    stub.start()
+
+    env = dict(os.environ, OPENAI_BASE_URL=f"http://127.0.0.1:{stub_port}/v1", OPENAI_API_KEY="bench",
+               ADMISSION_INTERACTIVE_RATE="0", ADMISSION_TOTAL_SLOTS="1024", ASGI_TOTAL_SLOTS="1024",
+               ADMISSION_INTERACTIVE_QUEUE="4096", ADMISSION_INTERACTIVE_TIMEOUT="600")
+    print(f"{'config':>13} | {'clients':>7} | {'req/s':>7} | {'p50':>6} | {'p95':>6} | {'errors':>6} | "
+          f"{'peak RSS':>9} | {'waiting':>7} | {'per GB':>7}")
+    try:
+        for name in args.configs:
+            cmd = CONFIGS[name] + ["-b", f"127.0.0.1:{app_port}", "--timeout", "600", "--backlog", "4096"]
+            server = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_ready(app_port)
+                proc = psutil.Process(server.pid)
+                for concurrency in args.concurrency:
+                    latencies, errors, elapsed, peak_rss, waiting = asyncio.run(
+                        load(app_port, concurrency, concurrency * args.rounds, proc, upstream))
+                    if not latencies:
+                        print(f"{name:>13} | {concurrency:>7} | all {errors} requests failed")
+                        continue
+                    throughput = len(latencies) / elapsed
+                    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+                    gb = peak_rss / 1024 ** 3
+                    print(f"{name:>13} | {concurrency:>7} | {throughput:7.1f} | {statistics.median(latencies):5.2f}s | "
+                          f"{p95:5.2f}s | {errors:>6} | {peak_rss / 1024 ** 2:8.0f}M | {waiting:>7} | "
+                          f"{waiting / gb:7.1f}")
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        stub.terminate()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
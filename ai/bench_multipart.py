@@ -0,0 +1,79 @@
+"""Per-response allocation of the interview multipart bodies: old concatenation vs ai.multipart.
+
+    python -m ai.bench_multipart [--sizes 50 500 5000] [--repeat 20]
+
+For each audio size (KB) the old way reads the TTS file, then joins the JSON
+part, headers, audio and closing boundary with `+`; the builder streams the
+same file in chunks. Bodies are consumed chunk by chunk, as a server writes
+them, and tracemalloc records the peak bytes allocated per response.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from .multipart import Part, MultipartBody
+
+PAYLOAD = {"question": "Tell me about a project where you used Python.", "model_answer": "A model answer.",
+           "score": "7.5"}
+
+
+def old_body(path: str):
+    # The body /interview built before ai.multipart.
+    with open(path, "rb") as f:
+        file_bytes = f.read()
+    boundary = "valecta"
+    json_part = f"--{boundary}\r\nContent-Type: application/json\r\n\r\n{json.dumps(PAYLOAD)}\r\n"
+    file_part = (
+        f"--{boundary}\r\n"
+        f"Content-Type: audio/mpeg\r\n"
+        f"Content-Disposition: attachment; filename=processed.mp3\r\n\r\n"
+    )
+    closing = f"\r\n--{boundary}--\r\n"
+    return [json_part.encode() + file_part.encode() + file_bytes + closing.encode()]
+
+
+def new_body(path: str):
+    return MultipartBody([Part.json(PAYLOAD), Part.file(path, "audio/mpeg", "processed.mp3")])
+
+
+def measure(build, path: str, repeat: int):
+    peaks, times = [], []
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        sent = 0
+        for chunk in build(path):
+            sent += len(chunk)
+        times.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return statistics.median(peaks), statistics.median(times), sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000], help="audio sizes in KB")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'audio':>8} | {'old peak':>10} | {'new peak':>10} | {'ratio':>6} | {'old time':>9} | {'new time':>9}")
+    for size in args.sizes:
+        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
+            f.write(os.urandom(size * 1024))
+        try:
+            old_peak, old_time, old_sent = measure(old_body, f.name, args.repeat)
+            new_peak, new_time, new_sent = measure(new_body, f.name, args.repeat)
+        finally:
+            os.remove(f.name)
+        # Same parts, only the boundary differs in length.
+        assert abs(old_sent - new_sent) < 200
+        print(f"{size:>6}KB | {old_peak / 1024:8.0f}KB | {new_peak / 1024:8.0f}KB | {old_peak / new_peak:5.1f}x | "
+              f"{old_time * 1000:7.2f}ms | {new_time * 1000:7.2f}ms")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from pathlib import Path
 from dotenv import load_dotenv
 from pydantic import BaseModel
@@ -8,6 +8,10 @@ import json
 load_dotenv()
 
 client = OpenAI()
+async_client = AsyncOpenAI()
+
+# As in main.py, _*_request helpers are shared by the sync functions and
+# their *_async twins used by ai/asgi.py.
 
 class Interview_question(BaseModel):
     question: str
@@ -28,16 +32,23 @@ def speech_to_text(audio_file_path: str):
 
     return transcription.text
 
-def text_to_speech(text: str, speech_file_path: str):
-    with client.audio.speech.with_streaming_response.create(
+def _speech_request(text: str):
+    return dict(
         model="tts-1",
         voice="alloy",
         input=text,
         instructions="Speak in a professional manner."
-    ) as response:
+    )
+
+def text_to_speech(text: str, speech_file_path: str):
+    with client.audio.speech.with_streaming_response.create(**_speech_request(text)) as response:
         response.stream_to_file(speech_file_path)
 
-def start_interview(job_description: str):
+async def text_to_speech_async(text: str) -> bytes:
+    async with async_client.audio.speech.with_streaming_response.create(**_speech_request(text)) as response:
+        return await response.read()
+
+def _start_interview_request(job_description: str):
     SYSTEM_PROMPT = f"""
         You are going to take an interview of a candidate for this post {job_description}. Your job is to properly greet the candidate and ask him to introduce himself. Also at the same time ask him about his prior experiences in this field, the projects he made and why is he interested for this job.
         Give the output in the following format:
@@ -45,16 +56,23 @@ def start_interview(job_description: str):
         You don't need any user input, you can directly give the output.
     """
 
-    response = client.chat.completions.create(
+    return dict(
         model="gpt-4.1",
         messages=[
             { "role": "system", "content": SYSTEM_PROMPT }
         ]
     )
 
+def start_interview(job_description: str):
+    response = client.chat.completions.create(**_start_interview_request(job_description))
+
     parsed = json.loads(response.choices[0].message.content)
     return parsed.get("ai_starter")
 
+async def start_interview_async(job_description: str):
+    response = await async_client.chat.completions.create(**_start_interview_request(job_description))
+    return json.loads(response.choices[0].message.content).get("ai_starter")
+
 # def end_interview():
 #     SYSTEM_PROMPT = """
 #         You are an AI interviewer. Your job is to end the interview. You should prepare an outro where you give best wishes to the candidate for his future prospects and also ask him to wait for response from our side.
@@ -76,7 +94,7 @@ def start_interview(job_description: str):
 #     parsed = json.loads(response.choices[0].message.content)
 #     return parsed.get("outro")
 
-def end_interview(job_description: str, user_answer: str):
+def _end_interview_request(job_description: str, user_answer: str):
     SYSTEM_PROMPT = f"""
         You are an AI interviewer. Your job is to end the interview.
         You should prepare an outro where you:
@@ -96,7 +114,7 @@ def end_interview(job_description: str, user_answer: str):
         }}
     """
 
-    response = client.beta.chat.completions.parse(
+    return dict(
         model="gpt-4.1",
         messages=[
             { "role": "system", "content": SYSTEM_PROMPT },
@@ -105,10 +123,17 @@ def end_interview(job_description: str, user_answer: str):
         response_format=Outro  # <-- define a JSON schema like Interview_question
     )
 
+def end_interview(job_description: str, user_answer: str):
+    response = client.beta.chat.completions.parse(**_end_interview_request(job_description, user_answer))
+
     return json.loads(response.choices[0].message.content).get("outro")
 
+async def end_interview_async(job_description: str, user_answer: str):
+    response = await async_client.beta.chat.completions.parse(**_end_interview_request(job_description, user_answer))
+    return json.loads(response.choices[0].message.content).get("outro")
 
-def ai_client(job_description: str, user_answer: str):
+
+def _ai_client_request(job_description: str, user_answer: str):
     SYSTEM_PROMPT = f"""
         You are an AI interviewer. Your job is to ask a question and also provide its model answer.
         You should behave in a way that a real human interviewer does. Like instead of asking pre-formulated questions, you should make questions having the context of the previous answer the candidate give, and you might ask on something that particularly seems interesting while being related at the same time.
@@ -118,7 +143,7 @@ def ai_client(job_description: str, user_answer: str):
         {job_description}
         You have to follow the Output JSON properly.
     """
-    response = client.beta.chat.completions.parse(
+    return dict(
         model="gpt-4.1",
         messages=[
             { "role": "system", "content": SYSTEM_PROMPT },
@@ -126,9 +151,16 @@ def ai_client(job_description: str, user_answer: str):
         ],
         response_format=Interview_question
     )
+
+def ai_client(job_description: str, user_answer: str):
+    response = client.beta.chat.completions.parse(**_ai_client_request(job_description, user_answer))
     return(json.loads(response.choices[0].message.content))
 
-def ai_review(job_description: str, question: str, model_answer: str, audio_text: str) -> float:
+async def ai_client_async(job_description: str, user_answer: str):
+    response = await async_client.beta.chat.completions.parse(**_ai_client_request(job_description, user_answer))
+    return json.loads(response.choices[0].message.content)
+
+def _ai_review_request(job_description: str, question: str, model_answer: str, audio_text: str):
     SYSTEM_PROMPT = f"""
         You are an intelligent AI supervisor that reviews the answer of a candidate against a model answer and grade their answer.
         Scoring rules:
@@ -137,7 +169,7 @@ def ai_review(job_description: str, question: str, model_answer: str, audio_text
 
         The question is {question} and the model answer is {model_answer}.
     """
-    response = client.beta.chat.completions.parse(
+    return dict(
         model="gpt-4.1",
         messages=[
             { "role": "system", "content": SYSTEM_PROMPT },
@@ -145,12 +177,22 @@ def ai_review(job_description: str, question: str, model_answer: str, audio_text
         ],
         response_format=Grade
     )
+
+def _parse_score(response) -> float:
     try:
         parsed = json.loads(response.choices[0].message.content)
         return float(parsed.get("score", 0.0))
     except Exception:
         return 0.0
 
+def ai_review(job_description: str, question: str, model_answer: str, audio_text: str) -> float:
+    response = client.beta.chat.completions.parse(**_ai_review_request(job_description, question, model_answer, audio_text))
+    return _parse_score(response)
+
+async def ai_review_async(job_description: str, question: str, model_answer: str, audio_text: str) -> float:
+    response = await async_client.beta.chat.completions.parse(**_ai_review_request(job_description, question, model_answer, audio_text))
+    return _parse_score(response)
+
 # if __name__ == "__main__":
 #     # path = Path(__file__).parent / "audio_store" / "Recording.m4a"
 #     # text = speech_to_text(path)
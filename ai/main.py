@@ -1,9 +1,10 @@
-import base64
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
 from pathlib import Path
 import json
 from pydantic import BaseModel
+from .resume import ResumeDocument
+from .path_cache import PathCache
 # import os
 # from pinecone import Pinecone
 # from neo4j import GraphDatabase
@@ -21,6 +22,7 @@ load_dotenv()
 # EMBED_DIM = 3072
 
 client = OpenAI()
+async_client = AsyncOpenAI()
 
 # pc = Pinecone(api_key=PINECONE_API_KEY)
 # if PINECONE_INDEX not in [index.name for index in pc.list_indexes()]:
@@ -33,6 +35,8 @@ client = OpenAI()
 
 # neo_driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
 
+path_cache = PathCache()
+
 class BoolModel(BaseModel):
     response: bool
 
@@ -47,13 +51,10 @@ class StringModel(BaseModel):
 # def uuid_now(prefix=""):
 #     return f"{prefix}{uuid.uuid4().hex[:8]}_{int(time.time())}"
 
-def skills_extract(file_path: str):
-    # file_path = Path(__file__).parent / "store" / "resume.pdf"
-    with open(file_path, "rb") as f:
-        data = f.read()
-
-    base64_string = base64.b64encode(data).decode("utf-8")
+# Each call is built once by a _*_request helper so the sync functions and
+# their *_async twins (used by ai/asgi.py) always send the same prompt.
 
+def _skills_request(resume: ResumeDocument):
     SYSTEM_PROMPT = f"""
         You are an intelligent AI agent that takes a resume image as the input and you properly analyse the image to find out about the qualifications of the person, specifically their skills or any type of specializations they have and give the output in the proper JSON format.
 
@@ -63,7 +64,19 @@ def skills_extract(file_path: str):
         }}
     """
 
-    response = client.responses.create(
+    if resume.is_pdf:
+        content = [
+            {
+                "type": "input_file",
+                "filename": resume.filename,
+                "file_data": f"data:application/pdf;base64,{resume.base64}",
+            }
+        ]
+    else:
+        # Only PDFs are attached as files; DOCX resumes go as extracted text.
+        content = [{"type": "input_text", "text": resume.text}]
+
+    return dict(
         model="gpt-5",
         input=[
             {
@@ -72,22 +85,27 @@ def skills_extract(file_path: str):
             },
             {
                 "role": "user",
-                "content": [
-                    {
-                        "type": "input_file",
-                        "filename": "resume.pdf",
-                        "file_data": f"data:application/pdf;base64,{base64_string}",
-                    }
-                ],
+                "content": content,
             },
         ]
     )
 
+def skills_extract(resume: ResumeDocument):
+    # file_path = Path(__file__).parent / "store" / "resume.pdf"
+    if not isinstance(resume, ResumeDocument):
+        resume = ResumeDocument.from_path(resume)
+
+    response = client.responses.create(**_skills_request(resume))
+
     output_json = json.loads(response.output_text)
 
     return output_json["skills"]
 
-def check_with_jd(skills, jd: str):
+async def skills_extract_async(resume: ResumeDocument):
+    response = await async_client.responses.create(**_skills_request(resume))
+    return json.loads(response.output_text)["skills"]
+
+def _check_with_jd_request(skills, jd: str):
     
     SYSTEM_PROMPT = f"""
         You are an intelligent agent that checks whether a person is capable for the job whose description is given by the user having following skills. Follow the output JSON format.
@@ -96,7 +114,7 @@ def check_with_jd(skills, jd: str):
         {skills} 
     """
 
-    response = client.beta.chat.completions.parse(
+    return dict(
         model="gpt-4.1",
         messages=[
             { "role": "system", "content": SYSTEM_PROMPT },
@@ -104,10 +122,17 @@ def check_with_jd(skills, jd: str):
         ],
         response_format=BoolModel
     )
+
+def check_with_jd(skills, jd: str):
+    response = client.beta.chat.completions.parse(**_check_with_jd_request(skills, jd))
     output = json.loads(response.choices[0].message.content)
     return output['response']
 
-def path_predictor(skills):
+async def check_with_jd_async(skills, jd: str):
+    response = await async_client.beta.chat.completions.parse(**_check_with_jd_request(skills, jd))
+    return json.loads(response.choices[0].message.content)['response']
+
+def _path_predictor_request(skills):
     SYSTEM_PROMPT = f"""
         You are a career advisor AI. Your job is to analyze user's current skills or work experience(if any) and recommend realistic and strategic carrer paths they can pursue.
 
@@ -123,7 +148,7 @@ def path_predictor(skills):
     #The complete solution should be one string not a JSON however when giving output just use the format.
     #Use when string required
 
-    response = client.beta.chat.completions.parse(
+    return dict(
         model="gpt-4.1",
         messages=[
             { "role": "system", "content": SYSTEM_PROMPT },
@@ -131,7 +156,39 @@ def path_predictor(skills):
         ],
         response_format=StringModel
     )
+
+# cache: "use" serves stored roadmaps, "refresh" regenerates and stores,
+# "bypass" neither reads nor writes the cache.
+CACHE_MODES = ("use", "refresh", "bypass")
+
+def _check_cache_mode(cache: str):
+    if cache not in CACHE_MODES:
+        raise ValueError(f"cache must be one of {', '.join(CACHE_MODES)}")
+
+def path_predictor(skills, cache: str = "use"):
+    _check_cache_mode(cache)
+    if cache == "use":
+        cached = path_cache.get(skills)
+        if cached is not None:
+            return cached
+
+    response = client.beta.chat.completions.parse(**_path_predictor_request(skills))
+    output = json.loads(response.choices[0].message.content)
+    if cache != "bypass":
+        path_cache.put(skills, output['response'])
+    return output['response']
+
+async def path_predictor_async(skills, cache: str = "use"):
+    _check_cache_mode(cache)
+    if cache == "use":
+        cached = path_cache.get(skills)
+        if cached is not None:
+            return cached
+
+    response = await async_client.beta.chat.completions.parse(**_path_predictor_request(skills))
     output = json.loads(response.choices[0].message.content)
+    if cache != "bypass":
+        path_cache.put(skills, output['response'])
     return output['response']
 
 # def generate_questions(skills, jd):
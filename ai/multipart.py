@@ -0,0 +1,105 @@
+import os
+import json
+import secrets
+
+CHUNK_SIZE = 64 * 1024
+
+
+class Part:
+    """One part of a multipart body: encoded headers plus in-memory bytes or a file on disk."""
+
+    def __init__(self, headers: dict, data: bytes = b"", path=None, delete: bool = False):
+        self.head = "".join(f"{name}: {value}\r\n" for name, value in headers.items()).encode()
+        self.data = data
+        self.path = path
+        self.delete = delete
+
+    @classmethod
+    def json(cls, payload):
+        return cls({"Content-Type": "application/json"}, json.dumps(payload).encode())
+
+    @classmethod
+    def raw(cls, data: bytes, content_type: str, filename: str = None):
+        return cls(_headers(content_type, filename), data)
+
+    @classmethod
+    def file(cls, path, content_type: str, filename: str = None, delete: bool = False):
+        return cls(_headers(content_type, filename), path=path, delete=delete)
+
+    def size(self) -> int:
+        return os.path.getsize(self.path) if self.path is not None else len(self.data)
+
+    def chunks(self):
+        if self.path is None:
+            # Yield the original object: WSGI servers need bytes, and
+            # handing it over whole avoids slicing copies.
+            if self.data:
+                yield self.data
+            return
+        with open(self.path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                yield chunk
+
+    def cleanup(self):
+        if self.delete and self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print("File delete error: ", e)
+            self.delete = False
+
+
+def _headers(content_type: str, filename: str = None):
+    headers = {"Content-Type": content_type}
+    if filename:
+        headers["Content-Disposition"] = f"attachment; filename={filename}"
+    return headers
+
+
+class MultipartBody:
+    """Streams parts as a sequence of bytes chunks instead of concatenating one big body.
+
+    The boundary is random per response so it can't collide with the audio
+    payload. Pass the body straight to a Flask or Quart Response; it closes
+    (and deletes temporary files) once the server is done with it.
+    """
+
+    def __init__(self, parts, subtype: str = "mixed"):
+        self.parts = list(parts)
+        self.boundary = f"valecta-{secrets.token_hex(16)}"
+        self.content_type = f"multipart/{subtype}; boundary={self.boundary}"
+        self._delimiter = f"--{self.boundary}\r\n".encode()
+        self._closing = f"--{self.boundary}--\r\n".encode()
+
+    @property
+    def content_length(self) -> int:
+        framing = len(self._delimiter) + 2 + 2  # delimiter, blank line after headers, CRLF after body
+        return sum(framing + len(p.head) + p.size() for p in self.parts) + len(self._closing)
+
+    def headers(self) -> dict:
+        try:
+            return {"Content-Length": str(self.content_length)}
+        except OSError:
+            return {}
+
+    def __iter__(self):
+        try:
+            for part in self.parts:
+                yield self._delimiter
+                yield part.head + b"\r\n"
+                yield from part.chunks()
+                yield b"\r\n"
+            yield self._closing
+        finally:
+            self.close()
+
+    def close(self):
+        for part in self.parts:
+            part.cleanup()
+
+
+def multipart_response(response_class, *parts, subtype: str = "mixed"):
+    body = MultipartBody(parts, subtype)
+    return response_class(body, mimetype=body.content_type, headers=body.headers())
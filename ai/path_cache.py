@@ -0,0 +1,144 @@
+import os
+import re
+import math
+import time
+import threading
+from collections import OrderedDict
+
+# Roadmaps are per process; each gunicorn worker keeps its own cache.
+MAX_ENTRIES = int(os.getenv("PATH_CACHE_SIZE", "512"))
+MAX_DISTANCE = float(os.getenv("PATH_CACHE_MAX_DISTANCE", "0.15"))
+TTL_SECONDS = float(os.getenv("PATH_CACHE_TTL", str(24 * 3600)))
+
+SYNONYMS = {
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "postgres": "postgresql",
+    "mongo": "mongodb",
+    "k8s": "kubernetes",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "cv": "computer vision",
+    "aws": "amazon web services",
+    "gcp": "google cloud",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "tf": "tensorflow",
+    "c plus plus": "c++",
+    "cpp": "c++",
+    "c sharp": "c#",
+}
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def canonicalize_skills(skills) -> tuple:
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    canonical = set()
+    for skill in skills or []:
+        skill = _SPACE_RE.sub(" ", str(skill)).strip().casefold()
+        if skill:
+            canonical.add(SYNONYMS.get(skill, skill))
+    return tuple(sorted(canonical))
+
+
+def _similarity(a: frozenset, b: frozenset) -> float:
+    # Cosine similarity of the two skill sets as binary vectors. Canonical
+    # sets are small, so comparing them directly is cheap and exact.
+    if not a or not b:
+        return 0.0
+    return len(a & b) / math.sqrt(len(a) * len(b))
+
+
+class PathCache:
+    """LRU cache of roadmaps keyed on canonical skill sets, with a nearest-neighbour fallback."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_distance: float = MAX_DISTANCE,
+                 ttl: float = TTL_SECONDS):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (skill set, value, stored_at)
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl > 0 and time.monotonic() - stored_at > self.ttl
+
+    def _drop(self, key):
+        del self._entries[key]
+
+    def get(self, skills):
+        key = canonicalize_skills(skills)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[2]):
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry[1]
+
+            if self._entries and self.max_distance > 0:
+                skill_set = frozenset(key)
+                near_key, best = None, 0.0
+                for other, (other_set, _, _) in self._entries.items():
+                    similarity = _similarity(skill_set, other_set)
+                    if similarity > best:
+                        near_key, best = other, similarity
+                if near_key is not None and 1.0 - best <= self.max_distance:
+                    if not self._expired(self._entries[near_key][2]):
+                        self._entries.move_to_end(near_key)
+                        self.similar_hits += 1
+                        return self._entries[near_key][1]
+                    self._drop(near_key)
+
+            self.misses += 1
+            return None
+
+    def put(self, skills, value):
+        key = canonicalize_skills(skills)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            elif len(self._entries) >= self.max_entries:
+                self._drop(next(iter(self._entries)))
+            self._entries[key] = (frozenset(key), value, time.monotonic())
+
+    def invalidate(self, skills=None):
+        with self._lock:
+            if skills is None:
+                for key in list(self._entries):
+                    self._drop(key)
+            elif canonicalize_skills(skills) in self._entries:
+                self._drop(canonicalize_skills(skills))
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.exact_hits + self.similar_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_distance": self.max_distance,
+                "exact_hits": self.exact_hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "hit_rate": (self.exact_hits + self.similar_hits) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,107 @@
+"""Benchmark the winnowing index against a brute-force scan at several corpus sizes.
+
+    python -m ai.plagiarism.bench_fingerprint [--sizes 2500 10000 50000] [--queries 50]
+
+Uses Resume.csv (tiled to reach larger sizes) when present, otherwise a
+synthetic Zipf-distributed corpus of resume-length documents.
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from ..resume import clean_text
+from .fingerprint import FingerprintIndex, fingerprints
+
+CSV_PATH = Path(__file__).parent / "Resume.csv"
+
+
+def load_corpus(size: int, seed: int = 0):
+    if CSV_PATH.exists():
+        import pandas as pd
+        base = pd.read_csv(CSV_PATH).dropna()["Resume_str"].map(clean_text).tolist()
+    else:
+        rng = np.random.default_rng(seed)
+        vocab = np.array([f"w{i}" for i in range(20000)])
+        weights = 1.0 / np.arange(1, len(vocab) + 1)
+        weights /= weights.sum()
+        base = [" ".join(rng.choice(vocab, size=800, p=weights)) for _ in range(min(size, 2500))]
+    corpus = list(base[:size])
+    copy = 0
+    while len(corpus) < size:
+        # Tiled copies get their own vocabulary so they don't inflate
+        # document frequencies and trip the boilerplate filter.
+        copy += 1
+        suffix = _letters(copy)
+        corpus.extend(" ".join(t + suffix for t in text.split()) for text in base[:size - len(corpus)])
+    return corpus
+
+
+def _letters(n: int) -> str:
+    out = ""
+    while n:
+        n, r = divmod(n - 1, 26)
+        out = chr(ord("a") + r) + out
+    return out
+
+
+def make_query(corpus, rng: random.Random):
+    # Half original text, half a paragraph lifted from a random corpus resume.
+    filler = rng.choice(corpus).split()
+    rng.shuffle(filler)
+    source = rng.choice(corpus).split()
+    start = rng.randrange(max(1, len(source) - 80))
+    return " ".join(filler[:200] + source[start:start + 80] + filler[200:400])
+
+
+def brute_force(query: str, corpus_prints):
+    q = set(fingerprints(query)[0].tolist())
+    return max(range(len(corpus_prints)), key=lambda i: len(q & corpus_prints[i]))
+
+
+def run(size: int, n_queries: int):
+    corpus = load_corpus(size)
+    start = time.perf_counter()
+    index = FingerprintIndex.build(corpus)
+    build_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "fingerprints"
+        index.save(path)
+        disk_mb = sum(f.stat().st_size for f in path.iterdir()) / 1e6
+        start = time.perf_counter()
+        FingerprintIndex.load(path, mmap=False)
+        load_s = time.perf_counter() - start
+
+    rng = random.Random(size)
+    queries = [make_query(corpus, rng) for _ in range(n_queries)]
+    start = time.perf_counter()
+    for query in queries:
+        index.query(query, top_n=1)
+    query_ms = (time.perf_counter() - start) / n_queries * 1e3
+
+    brute_ms = float("nan")
+    if size <= 10000:
+        corpus_prints = [set(fingerprints(text)[0].tolist()) for text in corpus]
+        start = time.perf_counter()
+        for query in queries[:5]:
+            brute_force(query, corpus_prints)
+        brute_ms = (time.perf_counter() - start) / min(5, n_queries) * 1e3
+
+    print(f"{size:>7} docs | {len(index):>10} prints | build {build_s:6.2f}s | "
+          f"{disk_mb:7.1f} MB on disk, load {load_s * 1e3:6.1f}ms | "
+          f"query {query_ms:6.2f}ms | brute force {brute_ms:8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2500, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Report resident memory per worker for the plagiarism corpus, full vs lean mode.
+
+    python -m ai.plagiarism.bench_memory [--sizes 2500 10000 25000]
+
+Each measurement runs in a fresh interpreter so the numbers are what one
+gunicorn worker would hold after importing the corpus. Uses Resume.csv
+(tiled to reach larger sizes) when present, otherwise a synthetic corpus
+with the same columns.
+
+The fingerprint index is measured the same way, memory-mapped and as an
+np.load copy: mapped pages are file-backed and shared by every worker,
+a copy is private (anonymous) memory in each one.
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import psutil
+
+CSV_PATH = Path(__file__).parent / "Resume.csv"
+
+
+def write_corpus(size: int, out_path: Path):
+    if CSV_PATH.exists():
+        base = pd.read_csv(CSV_PATH)
+    else:
+        rng = np.random.default_rng(0)
+        vocab = np.array([f"skill{chr(97 + i % 26)}{chr(97 + i // 26 % 26)}{chr(97 + i // 676 % 26)}"
+                          for i in range(20000)])
+        weights = 1.0 / np.arange(1, len(vocab) + 1)
+        weights /= weights.sum()
+        texts = [" ".join(rng.choice(vocab, size=800, p=weights)) + ". Contact: https://example.com"
+                 for _ in range(2500)]
+        base = pd.DataFrame({
+            "ID": range(len(texts)),
+            "Resume_str": texts,
+            "Resume_html": [f"<div class=\"resume\"><p>{t}</p></div>" for t in texts],
+            "Category": rng.choice(["HR", "DESIGNER", "INFORMATION-TECHNOLOGY", "TEACHER", "ADVOCATE",
+                                    "BUSINESS-DEVELOPMENT", "HEALTHCARE", "FITNESS", "AGRICULTURE"], len(texts)),
+        })
+    reps = -(-size // len(base))
+    pd.concat([base] * reps, ignore_index=True).iloc[:size].to_csv(out_path, index=False)
+
+
+def child(csv_path: str, lean: bool):
+    from .corpus import load_corpus, release_memory
+    process = psutil.Process()
+    release_memory()
+    before = process.memory_info().rss
+    corpus, cleaned = load_corpus(csv_path, lean=lean)
+    del cleaned
+    release_memory()
+    after = process.memory_info().rss
+    print(before, after, corpus.nbytes(), corpus.X.dtype)
+
+
+def rss_split():
+    """(anonymous, file-backed) resident bytes of this process."""
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(("RssAnon:", "RssFile:")):
+                name, value, _ = line.split()
+                fields[name] = int(value) * 1024
+    return fields["RssAnon:"], fields["RssFile:"]
+
+
+def index_child(index_path: str, mmap: bool):
+    from .fingerprint import FingerprintIndex
+    anon, file = rss_split()
+    index = FingerprintIndex.load(index_path, mmap=mmap)
+    # Fault every page in, as a worker serving queries eventually does.
+    int(index.hashes.sum()) + int(index.doc_ids.sum()) + int(index.offsets.sum())
+    after_anon, after_file = rss_split()
+    print(after_anon - anon, after_file - file)
+
+
+def build_index(csv_path: Path, index_root: Path) -> Path:
+    from ..resume import clean_text
+    from .fingerprint import load_or_build
+    cleaned = pd.read_csv(csv_path, usecols=["Resume_str"]).dropna()["Resume_str"].map(clean_text).tolist()
+    load_or_build(cleaned, index_root)
+    return next(index_root.iterdir())
+
+
+def measure_index(index_path: Path, mmap: bool):
+    out = subprocess.run(
+        [sys.executable, "-m", "ai.plagiarism.bench_memory", "--index-child", str(index_path), "1" if mmap else "0"],
+        check=True, capture_output=True, text=True,
+    ).stdout.splitlines()[-1].split()
+    return int(out[0]), int(out[1])
+
+
+def measure(csv_path: Path, lean: bool):
+    out = subprocess.run(
+        [sys.executable, "-m", "ai.plagiarism.bench_memory", "--child", str(csv_path), "1" if lean else "0"],
+        check=True, capture_output=True, text=True,
+    ).stdout.splitlines()[-1].split()
+    return int(out[0]), int(out[1]), int(out[2]), out[3]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2500, 10000, 25000])
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    parser.add_argument("--index-child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child[0], args.child[1] == "1")
+        return
+    if args.index_child:
+        index_child(args.index_child[0], args.index_child[1] == "1")
+        return
+
+    mb = 1024 * 1024
+    print(f"{'docs':>7} | {'mode':>4} | {'baseline':>9} | {'after load':>10} | {'corpus RSS':>10} | {'structures':>10} | dtype")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            csv_path = Path(tmp) / f"resumes_{size}.csv"
+            write_corpus(size, csv_path)
+            for lean in (False, True):
+                before, after, nbytes, dtype = measure(csv_path, lean)
+                print(f"{size:>7} | {'lean' if lean else 'full':>4} | {before / mb:8.1f}M | {after / mb:9.1f}M | "
+                      f"{(after - before) / mb:9.1f}M | {nbytes / mb:9.1f}M | {dtype}")
+
+    print()
+    print(f"{'docs':>7} | {'index':>6} | {'on disk':>8} | {'private':>8} | {'shared':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            csv_path = Path(tmp) / f"resumes_{size}.csv"
+            write_corpus(size, csv_path)
+            index_path = build_index(csv_path, Path(tmp) / f"fingerprints_{size}")
+            disk = sum(f.stat().st_size for f in index_path.iterdir())
+            for mmap in (False, True):
+                private, shared = measure_index(index_path, mmap)
+                print(f"{size:>7} | {'mmap' if mmap else 'copy':>6} | {disk / mb:7.1f}M | {private / mb:7.1f}M | "
+                      f"{shared / mb:7.1f}M")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+import gc
+import ctypes
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from ..resume import clean_text
+
+# Lean mode keeps only what lookups need: the float32 TF-IDF matrix and
+# integer-coded categories. The DataFrame and both text columns are only
+# needed to fit the vectorizer and are released afterwards.
+LEAN_CORPUS = os.getenv("PLAGIARISM_LEAN", "1") == "1"
+
+
+class Corpus:
+    def __init__(self, vectorizer, X, category_codes, category_labels, df=None):
+        self.vectorizer = vectorizer
+        self.X = X
+        self.category_codes = category_codes
+        self.category_labels = category_labels
+        self.df = df
+
+    def category(self, index: int) -> str:
+        return self.category_labels[self.category_codes[index]]
+
+    def similarity(self, vec) -> np.ndarray:
+        # Rows of X and vec are L2-normalised, so the dot product is the cosine.
+        return (self.X @ vec.T).toarray().ravel()
+
+    def nbytes(self) -> int:
+        size = self.X.data.nbytes + self.X.indices.nbytes + self.X.indptr.nbytes + self.category_codes.nbytes
+        if self.df is not None:
+            size += int(self.df.memory_usage(deep=True).sum())
+        return size
+
+
+def load_corpus(path, lean: bool = LEAN_CORPUS, limit: int = None):
+    """Fit the plagiarism corpus; returns (Corpus, cleaned texts) so callers can build other indexes before dropping the text."""
+    if lean:
+        df = pd.read_csv(path, usecols=["Resume_str", "Category"], nrows=limit)
+    else:
+        df = pd.read_csv(path, nrows=limit)
+    df = df.dropna().reset_index(drop=True)
+
+    codes, labels = pd.factorize(df["Category"])
+    category_codes = codes.astype(np.int16 if len(labels) < 2 ** 15 else np.int32)
+
+    if lean:
+        cleaned = [clean_text(text) for text in df["Resume_str"]]
+        del df
+        vectorizer = TfidfVectorizer(stop_words="english", dtype=np.float32)
+        X = vectorizer.fit_transform(cleaned)
+        return Corpus(vectorizer, X, category_codes, list(labels)), cleaned
+
+    df["Cleaned"] = df["Resume_str"].apply(clean_text)
+    vectorizer = TfidfVectorizer(stop_words="english")
+    X = vectorizer.fit_transform(df["Cleaned"])
+    return Corpus(vectorizer, X, category_codes, list(labels), df), df["Cleaned"]
+
+
+def release_memory():
+    # Freed text columns stay in the process heap unless glibc is asked to
+    # hand them back, so a lean worker would otherwise keep its fit-time peak.
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
@@ -1,60 +1,38 @@
-import pandas as pd
-import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import fitz  # PyMuPDF
-import docx
+import asyncio
 import requests
+import re
 import os
 from pathlib import Path
+from urllib.parse import urlparse
+from ..resume import ResumeDocument, clean_text, URL_RE
+from .fingerprint import load_or_build
+from .corpus import load_corpus, release_memory
 
 # --- 1. Load Dataset ---
 path = Path(__file__).parent /"Resume.csv"
-df = pd.read_csv(path)
-df = df.dropna().reset_index(drop=True)
-resume_texts = df["Resume_str"]
-
-def clean_text(text):
-    text = re.sub(r"http\S+", "", text)
-    text = re.sub(r"[^a-zA-Z]", " ", text)
-    text = text.lower()
-    return text
+corpus, cleaned_corpus = load_corpus(path)
+vectorizer = corpus.vectorizer
+X = corpus.X
+fingerprint_index = load_or_build(cleaned_corpus)
+del cleaned_corpus
+release_memory()
 
-df["Cleaned"] = resume_texts.apply(clean_text)
-vectorizer = TfidfVectorizer(stop_words="english")
-X = vectorizer.fit_transform(df["Cleaned"])
+# A resume sharing this fraction of its words with one corpus document in
+# copied passages counts as plagiarised even if the whole-document score is low.
+PASSAGE_COVERAGE_THRESHOLD = float(os.getenv("PASSAGE_COVERAGE_THRESHOLD", "0.35"))
 
 # --- 2. Extract Text from Resume ---
-def extract_text_from_pdf_pymupdf(pdf_path):
-    try:
-        doc = fitz.open(pdf_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        return text
-    except Exception as e:
-        print(f"PyMuPDF PDF Text extraction error: {e}")
-        return ""
-
-def extract_text_from_docx(docx_path):
-    doc = docx.Document(docx_path)
-    return " ".join([para.text for para in doc.paragraphs])
-
+# Parsing lives in ResumeDocument so the file is opened once per review.
 def extract_resume_text(file_path):
-    if file_path.lower().endswith(".pdf"):
-        return extract_text_from_pdf_pymupdf(file_path)
-    elif file_path.lower().endswith(".docx"):
-        return extract_text_from_docx(file_path)
-    else:
-        raise ValueError("Unsupported file format. Only PDF and DOCX supported.")
+    return ResumeDocument.from_path(file_path).text
 
 # --- 3. Extract URLs from Resume ---
 def extract_urls(text):
-    url_pattern = r'https?://[^\s,]+'
-    all_urls = re.findall(url_pattern, text)
+    return filter_certificate_urls(URL_RE.findall(text))
+
+def filter_certificate_urls(all_urls):
     if not all_urls:
         return []
-    from urllib.parse import urlparse
     allowed_domains = {
         "coursera.org",
         "udemy.com",
@@ -96,13 +74,14 @@ def extract_urls(text):
     return filtered
 
 # --- 4. Plagiarism Check (Resume) ---
-def check_similarity(uploaded_resume_text, threshold=0.75, source="resume"):
-    cleaned_resume = clean_text(uploaded_resume_text)
+def check_similarity(uploaded_resume_text, threshold=0.75, source="resume", cleaned_resume=None):
+    if cleaned_resume is None:
+        cleaned_resume = clean_text(uploaded_resume_text)
     vec = vectorizer.transform([cleaned_resume])
-    similarity_scores = cosine_similarity(vec, X)[0]
+    similarity_scores = corpus.similarity(vec)
     max_score = similarity_scores.max()
     most_similar_index = similarity_scores.argmax()
-    category = df.iloc[most_similar_index]["Category"]
+    category = corpus.category(most_similar_index)
     if source == "resume":
         if max_score >= threshold:
             return f"❌ Resume Plagiarism Detected! Similarity: {max_score:.2f} | Closest Category: {category}"
@@ -112,55 +91,95 @@ def check_similarity(uploaded_resume_text, threshold=0.75, source="resume"):
         # Only verification, no similarity score
         return f"✅ Certificate Verified!"
 
+def check_passages(cleaned_resume, top_n=5):
+    matches = fingerprint_index.query(cleaned_resume, top_n=top_n)
+    tokens = cleaned_resume.split()
+    for match in matches:
+        match["category"] = corpus.category(match["doc_id"])
+        match["passages"] = [
+            {"text": " ".join(tokens[start:end]), "start": start, "end": end, "corpus_offset": corpus_start}
+            for start, end, corpus_start in match["passages"]
+        ]
+    return matches
+
 # --- 5. Fetch Certificate Content from URLs ---
+def _certificate_page_text(url, status_code, body):
+    if status_code == 404:
+        print(f"Certificate URL '{url}' returned 404: Not a valid certificate.")
+        return None  # Indicate invalid certificate
+    return re.sub(r'<[^>]+>', '', body)[:1000]
+
 def fetch_certificate_text(url):
     try:
         resp = requests.get(url, timeout=5)
-        if resp.status_code == 404:
-            print(f"Certificate URL '{url}' returned 404: Not a valid certificate.")
-            return None  # Indicate invalid certificate
-        resp.raise_for_status()
-        text = re.sub(r'<[^>]+>', '', resp.text)
-        return text[:1000]
+        if resp.status_code != 404:
+            resp.raise_for_status()
+        return _certificate_page_text(url, resp.status_code, resp.text)
+    except Exception as e:
+        print(f"Error fetching certificate URL '{url}': {e}")
+        return ""
+
+async def fetch_certificate_text_async(url, http):
+    try:
+        resp = await http.get(url, timeout=5, follow_redirects=True)
+        if resp.status_code != 404:
+            resp.raise_for_status()
+        return _certificate_page_text(url, resp.status_code, resp.text)
     except Exception as e:
         print(f"Error fetching certificate URL '{url}': {e}")
         return ""
 
 # --- 6. Main Logic ---
-def plagiarism_checker(resume_file_path):
-    if not os.path.exists(resume_file_path):
-        return None, []
-    resume_text = extract_resume_text(resume_file_path)
-    cert_urls = extract_urls(resume_text)
+def _resume_verdict(resume):
     # Resume plagiarism check
     try:
-        result = check_similarity(resume_text, source="resume")
+        result = check_similarity(resume.text, source="resume", cleaned_resume=resume.cleaned_text)
         if result.startswith("❌ Resume Plagiarism Detected"):
             resume_bool = True
         elif result.startswith("✅ Resume is Unique"):
             resume_bool = False
         else:
             resume_bool = None
+        passages = check_passages(resume.cleaned_text, top_n=1)
+        if resume_bool is False and passages and passages[0]["coverage"] >= PASSAGE_COVERAGE_THRESHOLD:
+            resume_bool = True
     except Exception:
         resume_bool = None
+    return resume_bool
 
-    cert_results = []
-    for url in cert_urls:
-        cert_text = fetch_certificate_text(url)
-        if cert_text is None:
-            cert_results.append(False)
-            continue
-        if not cert_text.strip():
-            cert_results.append(None)
-            continue
-        cert_result = check_similarity(cert_text, source="certificate")
-        if cert_result.startswith("✅ Certificate Verified"):
-            cert_results.append(True)
-        else:
-            cert_results.append(None)
+def _certificate_verdict(cert_text):
+    if cert_text is None:
+        return False
+    if not cert_text.strip():
+        return None
+    cert_result = check_similarity(cert_text, source="certificate")
+    if cert_result.startswith("✅ Certificate Verified"):
+        return True
+    return None
+
+def _final_decision(resume_bool, cert_results):
     # Final decision logic
     if resume_bool in [True, None]:
         return False
     if any(c in [False, None] for c in cert_results):
         return False
     return True
+
+def plagiarism_checker(resume):
+    if not isinstance(resume, ResumeDocument):
+        if not Path(resume).exists():
+            return None, []
+        resume = ResumeDocument.from_path(resume)
+    cert_urls = filter_certificate_urls(resume.urls)
+    resume_bool = _resume_verdict(resume)
+    cert_results = [_certificate_verdict(fetch_certificate_text(url)) for url in cert_urls]
+    return _final_decision(resume_bool, cert_results)
+
+async def plagiarism_checker_async(resume, http):
+    # The similarity checks are CPU-bound and stay off the event loop;
+    # certificate pages are fetched concurrently.
+    cert_urls = filter_certificate_urls(resume.urls)
+    resume_task = asyncio.to_thread(_resume_verdict, resume)
+    cert_texts = asyncio.gather(*(fetch_certificate_text_async(url, http) for url in cert_urls))
+    resume_bool, cert_texts = await asyncio.gather(resume_task, cert_texts)
+    return _final_decision(resume_bool, [_certificate_verdict(text) for text in cert_texts])
@@ -0,0 +1,227 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Winnowing (Schleimer et al.) over word k-grams of cleaned text: any shared
+# passage of at least K + W - 1 words is guaranteed to share a fingerprint.
+K = int(os.getenv("FINGERPRINT_K", "5"))
+W = int(os.getenv("FINGERPRINT_W", "4"))
+# Fingerprints found in more documents than this are boilerplate
+# ("responsible for managing ..."), not evidence of copying.
+MAX_DOC_FREQ = int(os.getenv("FINGERPRINT_MAX_DOC_FREQ", "20"))
+# Saved as plain .npy files and memory-mapped, so every gunicorn worker
+# shares one copy of the index through the page cache.
+INDEX_DIR = Path(__file__).parent / "fingerprints"
+# Enough for the corpus vocabulary; query-only tokens age out instead of
+# accumulating for the life of the worker.
+TOKEN_CACHE_SIZE = int(os.getenv("FINGERPRINT_TOKEN_CACHE", "200000"))
+
+_BASE = np.uint64(1099511628211)
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+
+
+def _hash_tokens(tokens) -> np.ndarray:
+    return np.fromiter((_token_hash(token) for token in tokens), dtype=np.uint64, count=len(tokens))
+
+
+def corpus_digest(cleaned_texts) -> str:
+    """Content hash of the corpus, so an edited Resume.csv never reuses a stale index."""
+    digest = hashlib.blake2b(digest_size=16)
+    for text in cleaned_texts:
+        digest.update(text.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _mix(h: np.ndarray) -> np.ndarray:
+    # splitmix64 finaliser so the window minimum isn't biased by the polynomial.
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+def fingerprints(cleaned_text: str, k: int = K, w: int = W):
+    """Return (hashes, token_offsets) of the winnowed k-gram fingerprints of one text."""
+    tokens = cleaned_text.split()
+    if len(tokens) < k:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint32)
+
+    token_hashes = _hash_tokens(tokens)
+    grams = np.zeros(len(tokens) - k + 1, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for j in range(k):
+            grams = grams * _BASE + token_hashes[j:j + len(grams)]
+        grams = _mix(grams)
+
+    if len(grams) <= w:
+        positions = np.array([grams.argmin()])
+    else:
+        windows = sliding_window_view(grams, w)
+        positions = np.unique(np.arange(len(windows)) + windows.argmin(axis=1))
+    return grams[positions], positions.astype(np.uint32)
+
+
+class FingerprintIndex:
+    """Inverted index from fingerprint to (document, token offset), stored as parallel sorted arrays."""
+
+    def __init__(self, hashes: np.ndarray, doc_ids: np.ndarray, offsets: np.ndarray, n_docs: int,
+                 k: int = K, w: int = W, max_doc_freq: int = MAX_DOC_FREQ, digest: str = ""):
+        self.hashes = hashes
+        self.doc_ids = doc_ids
+        self.offsets = offsets
+        self.n_docs = n_docs
+        self.k = k
+        self.w = w
+        self.max_doc_freq = max_doc_freq
+        self.digest = digest
+
+    @classmethod
+    def build(cls, cleaned_texts, k: int = K, w: int = W, max_doc_freq: int = MAX_DOC_FREQ, digest: str = ""):
+        all_hashes, all_docs, all_offsets = [], [], []
+        n_docs = 0
+        for doc_id, text in enumerate(cleaned_texts):
+            n_docs += 1
+            hashes, offsets = fingerprints(text, k, w)
+            all_hashes.append(hashes)
+            all_offsets.append(offsets)
+            all_docs.append(np.full(len(hashes), doc_id, dtype=np.uint32))
+
+        hashes = np.concatenate(all_hashes) if all_hashes else np.empty(0, dtype=np.uint64)
+        doc_ids = np.concatenate(all_docs) if all_docs else np.empty(0, dtype=np.uint32)
+        offsets = np.concatenate(all_offsets) if all_offsets else np.empty(0, dtype=np.uint32)
+        order = np.lexsort((offsets, doc_ids, hashes))
+        hashes, doc_ids, offsets = hashes[order], doc_ids[order], offsets[order]
+
+        if max_doc_freq and len(hashes):
+            # Count distinct documents per hash and drop over-common fingerprints.
+            first_in_doc = np.ones(len(hashes), dtype=bool)
+            first_in_doc[1:] = (hashes[1:] != hashes[:-1]) | (doc_ids[1:] != doc_ids[:-1])
+            _, starts = np.unique(hashes, return_index=True)
+            doc_freq = np.add.reduceat(first_in_doc.astype(np.uint32), starts)
+            keep = np.repeat(doc_freq <= max_doc_freq, np.diff(np.append(starts, len(hashes))))
+            hashes, doc_ids, offsets = hashes[keep], doc_ids[keep], offsets[keep]
+        return cls(hashes, doc_ids, offsets, n_docs, k, w, max_doc_freq, digest)
+
+    def save(self, path):
+        """Write the index as a new directory; it is renamed into place only once complete."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = Path(tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"))
+        try:
+            for name in ("hashes", "doc_ids", "offsets"):
+                np.save(tmp_path / f"{name}.npy", getattr(self, name))
+            with open(tmp_path / "meta.json", "w") as f:
+                json.dump({"k": self.k, "w": self.w, "n_docs": self.n_docs,
+                           "max_doc_freq": self.max_doc_freq, "digest": self.digest}, f)
+            try:
+                os.rename(tmp_path, path)
+            except OSError:
+                if not path.is_dir():
+                    raise
+                # Another worker saved the same index first.
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+    @classmethod
+    def load(cls, path, mmap: bool = True):
+        path = Path(path)
+        with open(path / "meta.json") as f:
+            meta = json.load(f)
+        mmap_mode = "r" if mmap else None
+        hashes, doc_ids, offsets = (np.load(path / f"{name}.npy", mmap_mode=mmap_mode)
+                                    for name in ("hashes", "doc_ids", "offsets"))
+        return cls(hashes, doc_ids, offsets, meta["n_docs"], meta["k"], meta["w"], meta["max_doc_freq"],
+                   meta["digest"])
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def query(self, cleaned_text: str, top_n: int = 5, gap: int = None):
+        """Find corpus documents sharing passages with the text.
+
+        Returns a list of {"doc_id", "coverage", "passages"} sorted by coverage,
+        where coverage is the fraction of query words inside a shared k-gram and
+        each passage is a (query_start, query_end, doc_start) token span.
+        Runs one binary search per query fingerprint, independent of corpus size.
+        """
+        tokens = cleaned_text.split()
+        q_hashes, q_offsets = fingerprints(cleaned_text, self.k, self.w)
+        if not len(q_hashes) or not len(self.hashes):
+            return []
+
+        lo = np.searchsorted(self.hashes, q_hashes, side="left")
+        hi = np.searchsorted(self.hashes, q_hashes, side="right")
+        counts = hi - lo
+        if not counts.any():
+            return []
+        # Expand every [lo, hi) hit range into (query offset, index row) pairs.
+        rows = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        q_pos = np.repeat(q_offsets, counts)
+        docs = self.doc_ids[rows]
+        d_pos = self.offsets[rows]
+
+        gap = self.k + self.w if gap is None else gap
+        results = []
+        for doc_id in np.unique(docs):
+            mask = docs == doc_id
+            order = np.argsort(q_pos[mask], kind="stable")
+            starts, doc_starts = q_pos[mask][order], d_pos[mask][order]
+
+            covered = np.zeros(len(tokens), dtype=bool)
+            passages = []
+            for start, doc_start in zip(starts.tolist(), doc_starts.tolist()):
+                covered[start:start + self.k] = True
+                if passages and start - passages[-1][1] <= gap:
+                    passages[-1][1] = start + self.k
+                else:
+                    passages.append([start, start + self.k, doc_start])
+            results.append({
+                "doc_id": int(doc_id),
+                "coverage": float(covered.mean()),
+                "passages": [tuple(p) for p in passages],
+            })
+        results.sort(key=lambda r: r["coverage"], reverse=True)
+        return results[:top_n]
+
+
+def load_or_build(cleaned_texts, root=INDEX_DIR):
+    """Map the saved index for this corpus and these parameters, building and saving it first if needed."""
+    digest = corpus_digest(cleaned_texts)
+    # One directory per corpus and parameter set. A saved directory is never
+    # rewritten, so workers can keep it mapped while another one is built.
+    path = Path(root) / f"{digest}-k{K}-w{W}-df{MAX_DOC_FREQ}"
+    if path.is_dir():
+        try:
+            return FingerprintIndex.load(path)
+        except Exception as e:
+            print(f"Fingerprint index load error: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+
+    index = FingerprintIndex.build(cleaned_texts, max_doc_freq=MAX_DOC_FREQ, digest=digest)
+    try:
+        index.save(path)
+        # Map the saved copy instead of keeping the freshly built private one.
+        index = FingerprintIndex.load(path)
+        _remove_stale(root, keep=path)
+    except OSError as e:
+        print(f"Fingerprint index save error: {e}")
+    return index
+
+
+def _remove_stale(root, keep):
+    # Indexes for an older corpus or other parameters; in-progress saves start with a dot.
+    for entry in Path(root).iterdir():
+        if entry != keep and not entry.name.startswith(".") and entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
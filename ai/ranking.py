@@ -0,0 +1,93 @@
+import os
+import json
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .main import skills_extract, check_with_jd
+from .plagiarism.final import plagiarism_checker, vectorizer
+from .resume import ResumeDocument, clean_text
+
+# Only the best local matches are worth the LLM round trips.
+DEFAULT_TOP_K = int(os.getenv("RANK_TOP_K", "10"))
+MAX_LLM_CONCURRENCY = int(os.getenv("RANK_LLM_CONCURRENCY", "4"))
+SKILL_WEIGHT = 0.3
+
+
+def local_scores(job_description: str, documents, required_skills=None):
+    # One sparse transform for the JD plus every resume; TF-IDF rows are
+    # L2-normalised, so cosine similarity is just the dot product.
+    matrix = vectorizer.transform([clean_text(job_description)] + [doc.cleaned_text for doc in documents])
+    similarity = (matrix[1:] @ matrix[0].T).toarray().ravel()
+
+    skills = [" " + clean_text(skill).strip() + " " for skill in (required_skills or [])]
+    skills = [skill for skill in skills if skill.strip()]
+    if not skills:
+        return similarity, [None] * len(documents)
+
+    coverage = np.array([
+        sum(skill in f" {doc.cleaned_text} " for skill in skills) / len(skills)
+        for doc in documents
+    ])
+    return (1 - SKILL_WEIGHT) * similarity + SKILL_WEIGHT * coverage, coverage.tolist()
+
+
+def review_applicant(document: ResumeDocument, job_description: str):
+    extracted_skills = skills_extract(document)
+    skill_match = check_with_jd(extracted_skills, job_description)
+    plagiarism_check = plagiarism_checker(document)
+    return {
+        "skills": extracted_skills,
+        "skill_match": bool(skill_match),
+        "plagiarism_check": bool(plagiarism_check),
+        "value": bool(skill_match and plagiarism_check),
+    }
+
+
+def load_documents(applicants):
+    """Decode and parse every resume up front; raises ValueError naming the first bad one."""
+    documents = []
+    for i, applicant in enumerate(applicants):
+        try:
+            document = ResumeDocument.from_base64(applicant["filedata"], applicant.get("filename", "resume.pdf"))
+            document.cleaned_text
+        except Exception as e:
+            raise ValueError(f"Resume {applicant.get('id', i)}: {e}") from e
+        documents.append(document)
+    return documents
+
+
+def rank_applicants(job_description: str, applicants, documents, required_skills=None,
+                    top_k: int = DEFAULT_TOP_K, max_concurrency: int = MAX_LLM_CONCURRENCY):
+    """Yield NDJSON lines: the local ranking first, then each LLM review as it lands, then the shortlist.
+
+    documents are the parsed resumes from load_documents(), in applicant order.
+    """
+    scores, coverage = local_scores(job_description, documents, required_skills)
+
+    order = np.argsort(-scores, kind="stable").tolist()
+    ranked = [{
+        "id": applicants[i].get("id", i),
+        "score": round(float(scores[i]), 4),
+        "skill_coverage": coverage[i],
+    } for i in order]
+    yield json.dumps({"event": "ranking", "applicants": ranked}) + "\n"
+
+    order = order[:top_k]
+    reviews = {}
+    pool = ThreadPoolExecutor(max_workers=max(1, max_concurrency))
+    try:
+        futures = {pool.submit(review_applicant, documents[i], job_description): i for i in order}
+        for future in as_completed(futures):
+            i = futures[future]
+            applicant_id = applicants[i].get("id", i)
+            try:
+                reviews[i] = future.result()
+            except Exception as e:
+                reviews[i] = {"value": False, "error": str(e)}
+            yield json.dumps({"event": "review", "id": applicant_id, **reviews[i]}) + "\n"
+    finally:
+        # If the client disconnects the generator is closed mid-loop; don't
+        # wait for (or pay for) reviews nobody will read.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    shortlist = [entry for entry, i in zip(ranked, order) if reviews[i].get("value")]
+    yield json.dumps({"event": "shortlist", "applicants": shortlist}) + "\n"
@@ -0,0 +1,109 @@
+import asyncio
+import base64
+import os
+import re
+import threading
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+import fitz  # PyMuPDF
+import docx
+
+# Resumes longer than this are truncated; nobody reads page 40 of a CV.
+# With the cap in place pages are parsed serially: fanning a 30-page PDF out
+# to worker processes saved ~10ms and lost time below ~15 pages, since every
+# child needs its own copy of the file.
+MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "30"))
+
+# PyMuPDF is not thread-safe: every parse holds _pdf_lock (the gthread
+# server runs views concurrently), and async callers parse on one dedicated
+# thread so they never block the event loop on it.
+_pdf_lock = threading.Lock()
+_parse_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resume-parse")
+
+URL_RE = re.compile(r"https?://[^\s,]+")
+_NON_ALPHA_RE = re.compile(r"[^a-zA-Z]+")
+
+
+def clean_text(text: str) -> str:
+    text = URL_RE.sub("", text)
+    return _NON_ALPHA_RE.sub(" ", text).lower()
+
+
+class ResumeDocument:
+    """A resume parsed at most once; every derived view is computed lazily and cached."""
+
+    def __init__(self, data: bytes, filename: str = "resume.pdf", max_pages: int = MAX_PAGES):
+        self.data = data
+        self.filename = filename
+        self.max_pages = max_pages
+
+    @classmethod
+    def from_base64(cls, filedata: str, filename: str = "resume.pdf"):
+        return cls(base64.b64decode(filedata), filename)
+
+    @classmethod
+    def from_path(cls, file_path):
+        with open(file_path, "rb") as f:
+            data = f.read()
+        return cls(data, os.path.basename(str(file_path)))
+
+    @property
+    def is_pdf(self) -> bool:
+        return self.filename.lower().endswith(".pdf")
+
+    @cached_property
+    def base64(self) -> str:
+        return base64.b64encode(self.data).decode("utf-8")
+
+    @cached_property
+    def _parsed(self):
+        if self.is_pdf:
+            return self._parse_pdf()
+        if self.filename.lower().endswith(".docx"):
+            return self._parse_docx()
+        raise ValueError("Unsupported file format. Only PDF and DOCX supported.")
+
+    def _parse_pdf(self):
+        try:
+            pages = []
+            with _pdf_lock, fitz.open(stream=self.data, filetype="pdf") as doc:
+                for number in range(min(doc.page_count, self.max_pages)):
+                    page = doc[number]
+                    links = [link["uri"] for link in page.get_links() if link.get("uri")]
+                    pages.append((page.get_text(), links))
+            return pages
+        except Exception as e:
+            print(f"PyMuPDF PDF Text extraction error: {e}")
+            return []
+
+    def _parse_docx(self):
+        doc = docx.Document(BytesIO(self.data))
+        return [(" ".join(para.text for para in doc.paragraphs), [])]
+
+    async def parse_async(self):
+        """Parse off the event loop; afterwards every property is a cache hit."""
+        await asyncio.get_running_loop().run_in_executor(_parse_thread, lambda: (self.cleaned_text, self.urls))
+        return self
+
+    @cached_property
+    def pages(self) -> list[str]:
+        return [text for text, _ in self._parsed]
+
+    @cached_property
+    def text(self) -> str:
+        return "".join(self.pages)
+
+    @cached_property
+    def cleaned_text(self) -> str:
+        return clean_text(self.text)
+
+    @cached_property
+    def links(self) -> list[str]:
+        """URIs attached to link annotations, which often hide behind text like "Certificate"."""
+        return [uri for _, links in self._parsed for uri in links]
+
+    @cached_property
+    def urls(self) -> list[str]:
+        """URLs written in the text followed by annotation links, de-duplicated in order."""
+        return list(dict.fromkeys(URL_RE.findall(self.text) + self.links))
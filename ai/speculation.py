@@ -0,0 +1,206 @@
+import os
+import re
+import time
+import uuid
+import asyncio
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from .interview import ai_client, text_to_speech, ai_client_async, text_to_speech_async
+
+# While the candidate is still answering, the frontend posts partial
+# transcripts. We generate (and voice) the follow-up question from the
+# partial answer in the background; if the final answer is essentially the
+# partial we speculated on, /interview serves the prepared question instead
+# of making the candidate wait through two more round trips.
+
+SPECULATION_WORKERS = int(os.getenv("SPECULATION_WORKERS", "4"))
+# Don't bother speculating on the first few words of an answer.
+MIN_WORDS = int(os.getenv("SPECULATION_MIN_WORDS", "20"))
+# Regenerate once the answer has grown this many words past the basis.
+REGENERATE_AFTER_WORDS = int(os.getenv("SPECULATION_REGENERATE_WORDS", "20"))
+# A prepared question is still served if the final answer only adds this many words.
+MAX_TAIL_WORDS = int(os.getenv("SPECULATION_MAX_TAIL_WORDS", "20"))
+SESSION_TTL = float(os.getenv("SPECULATION_TTL", "300"))
+# Each speculation costs one question call and one TTS call.
+CALLS_PER_SPECULATION = 2
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def _words(text: str):
+    return _WORD_RE.findall(text.lower())
+
+
+def _shares_prefix(basis, words) -> bool:
+    return len(words) >= len(basis) and words[:len(basis)] == basis
+
+
+class Speculation:
+    def __init__(self, job_description: str, basis, future):
+        self.job_description = job_description
+        self.basis = basis
+        self.future = future
+        self.updated = time.monotonic()
+
+
+class SpeculationManager:
+    def __init__(self, audio_dir, workers: int = SPECULATION_WORKERS):
+        self.audio_dir = Path(audio_dir)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="speculation")
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self.started = 0
+        self.discarded = 0
+        self.wasted_calls = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _submit(self, job_description: str, answer: str):
+        return self._pool.submit(self._prepare, job_description, answer)
+
+    def _prepare(self, job_description: str, answer: str):
+        qna = ai_client(job_description, answer)
+        question = qna.get("question")
+        audio_path = self.audio_dir / f"speculative_{uuid.uuid4().hex}.mp3"
+        try:
+            text_to_speech(question, audio_path)
+            with open(audio_path, "rb") as f:
+                audio = f.read()
+        finally:
+            if audio_path.exists():
+                os.remove(audio_path)
+        return question, qna.get("answer"), audio
+
+    def _expire(self, now: float):
+        for session_id, spec in list(self._sessions.items()):
+            if now - spec.updated > SESSION_TTL:
+                self._discard(session_id)
+
+    def _discard(self, session_id):
+        self._drop(self._sessions.pop(session_id))
+
+    def _drop(self, spec: Speculation):
+        self.discarded += 1
+        if self._cancel(spec.future):
+            self.wasted_calls += CALLS_PER_SPECULATION
+
+    def _cancel(self, future) -> bool:
+        """Cancel a speculation; returns True if its calls were already spent."""
+        # A speculation that already started can't be stopped; its calls are wasted.
+        return not future.cancel()
+
+    def update(self, session_id: str, job_description: str, partial_answer: str) -> bool:
+        """Record a partial transcript; returns True when a new speculation was started."""
+        words = _words(partial_answer)
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            spec = self._sessions.get(session_id)
+            if spec is not None:
+                spec.updated = now
+                still_valid = (spec.job_description == job_description and _shares_prefix(spec.basis, words)
+                               and len(words) - len(spec.basis) < REGENERATE_AFTER_WORDS)
+                if still_valid:
+                    return False
+                self._discard(session_id)
+            if len(words) < MIN_WORDS:
+                return False
+            future = self._submit(job_description, partial_answer)
+            self._sessions[session_id] = Speculation(job_description, words, future)
+            self.started += 1
+            return True
+
+    def _claim(self, session_id: str, job_description: str, final_answer: str):
+        """Pop the session's speculation; returns (spec, usable) or (None, False) on a miss."""
+        with self._lock:
+            spec = self._sessions.pop(session_id, None)
+            if spec is None:
+                self.misses += 1
+                return None, False
+
+        words = _words(final_answer)
+        usable = (spec.job_description == job_description and _shares_prefix(spec.basis, words)
+                  and len(words) - len(spec.basis) <= MAX_TAIL_WORDS)
+        return spec, usable
+
+    def _settle(self, spec: Speculation, result):
+        with self._lock:
+            if result is not None:
+                self.hits += 1
+                return result
+            self._drop(spec)
+            self.misses += 1
+        return None
+
+    def take(self, session_id: str, job_description: str, final_answer: str):
+        """Return (question, model_answer, audio bytes) if the prepared question fits the final answer, else None."""
+        spec, usable = self._claim(session_id, job_description, final_answer)
+        if spec is None:
+            return None
+        result = None
+        if usable:
+            try:
+                result = spec.future.result()
+            except Exception as e:
+                print("Speculation error: ", e)
+        return self._settle(spec, result)
+
+    def stats(self) -> dict:
+        with self._lock:
+            finished = self.hits + self.misses
+            return {
+                "sessions": len(self._sessions),
+                "started": self.started,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / finished if finished else 0.0,
+                "discarded": self.discarded,
+                "wasted_calls": self.wasted_calls,
+                # Extra OpenAI calls per interview turn caused by speculation.
+                "wasted_calls_per_turn": self.wasted_calls / finished if finished else 0.0,
+            }
+
+
+class AsyncSpeculationManager(SpeculationManager):
+    """SpeculationManager for the async app: speculations are event-loop tasks making awaited calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self.started = 0
+        self.discarded = 0
+        self.wasted_calls = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _submit(self, job_description: str, answer: str):
+        return asyncio.ensure_future(self._prepare_async(job_description, answer))
+
+    async def _prepare_async(self, job_description: str, answer: str):
+        qna = await ai_client_async(job_description, answer)
+        question = qna.get("question")
+        return question, qna.get("answer"), await text_to_speech_async(question)
+
+    def _cancel(self, future) -> bool:
+        # Cancelling a task stops it mid-flight, but any call it had already
+        # sent is still billed, so only a finished task counts as fully wasted.
+        if future.done():
+            if not future.cancelled():
+                future.exception()  # mark retrieved so asyncio doesn't log it
+            return True
+        future.cancel()
+        return False
+
+    async def take_async(self, session_id: str, job_description: str, final_answer: str):
+        """take() for the async app: awaits the prepared question instead of blocking on it."""
+        spec, usable = self._claim(session_id, job_description, final_answer)
+        if spec is None:
+            return None
+        result = None
+        if usable:
+            try:
+                result = await spec.future
+            except Exception as e:
+                print("Speculation error: ", e)
+        return self._settle(spec, result)
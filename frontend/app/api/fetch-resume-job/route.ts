@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from "next/server";
 import { databases, storage } from "../../appwrite";
+import { aiClientHeaders } from "@/lib/ai-client";
 
 // Configuration constants
 const DATABASE_ID = process.env.NEXT_PUBLIC_APPWRITE_DATABASE_ID!;
@@ -92,6 +93,7 @@ Experience Level: ${jobDocument.experienceLevel || ""}
   method: "POST",
   headers: {
     "Content-Type": "application/json",
+    ...aiClientHeaders(request),
   },
   body: JSON.stringify({
     filedata: resumeBase64,
@@ -163,6 +163,7 @@ import * as path from "path";
 import FormData from "form-data";
 import fetch from "node-fetch";
 import OpenAI from "openai";
+import { aiClientHeaders } from "@/lib/ai-client";
 
 const DATABASE_ID = process.env.NEXT_PUBLIC_APPWRITE_DATABASE_ID!;
 const JOBS_COLLECTION_ID = process.env.NEXT_PUBLIC_APPWRITE_JOBS_COLLECTION_ID!;
@@ -253,7 +254,7 @@ Experience Level: ${jobDocument.experienceLevel || ""}
   const aiResponse = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/interview`, {
       method: "POST",
       body: flaskForm as any,
-      headers: flaskForm.getHeaders(),
+      headers: { ...flaskForm.getHeaders(), ...aiClientHeaders(req) },
     });
 
     if (!aiResponse.ok) {
@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from "next/server";
 import * as fs from "fs/promises";
+import { aiClientHeaders } from "@/lib/ai-client";
 
 export async function POST(request: NextRequest) {
   try {
@@ -22,7 +23,7 @@ export async function POST(request: NextRequest) {
     // ✅ Send base64 to Flask server
   const flaskResponse = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/path-predict`, {
       method: "POST",
-      headers: { "Content-Type": "application/json" },
+      headers: { "Content-Type": "application/json", ...aiClientHeaders(request) },
       body: JSON.stringify({ filedata: base64String }),
     });
 
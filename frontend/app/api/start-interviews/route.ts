@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from "next/server";
 import { databases } from "../../appwrite";
+import { aiClientHeaders } from "@/lib/ai-client";
 
 const DATABASE_ID = process.env.NEXT_PUBLIC_APPWRITE_DATABASE_ID!;
 const JOBS_COLLECTION_ID = process.env.NEXT_PUBLIC_APPWRITE_JOBS_COLLECTION_ID!;
@@ -54,7 +55,7 @@ Experience Level: ${jobDocument.experienceLevel || ""}
     // ✅ Call Flask AI server
   const aiResponse = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/start-interview`, {
       method: "POST",
-      headers: { "Content-Type": "application/json" },
+      headers: { "Content-Type": "application/json", ...aiClientHeaders(request) },
       body: JSON.stringify({ job_description: jobDescription }),
     });
 
@@ -0,0 +1,13 @@
+// Every call to the AI server comes from these API routes, so the AI server
+// sees this server's address for every user. Forward the browser's address
+// so its per-client rate limits apply per user, not to all users at once.
+export function aiClientHeaders(req: Request): Record<string, string> {
+  // The last X-Forwarded-For hop is the one our host's proxy appended;
+  // earlier entries are whatever the browser chose to send.
+  const forwarded = (req.headers.get("x-forwarded-for") || "")
+    .split(",")
+    .map((hop) => hop.trim())
+    .filter(Boolean);
+  const clientId = forwarded[forwarded.length - 1] || req.headers.get("x-real-ip") || "";
+  return clientId ? { "X-Client-Id": clientId } : {};
+}